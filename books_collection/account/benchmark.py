@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import tracemalloc
+from time import perf_counter
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from books_collection.account.models import Account
+from books_collection.account.schemas import AccountResponse, AccountsList
+from books_collection.common.responses import ModelResponse
+
+
+def build_engine(rows: int):
+    engine = create_engine('sqlite://')
+    Account.__table__.create(engine)
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Account),
+            [
+                {
+                    'username': f'user{number:06}',
+                    'email': f'user{number:06}@email.com',
+                    'password': 'not-a-real-hash',
+                }
+                for number in range(rows)
+            ],
+        )
+
+    return engine
+
+
+# caminho anterior: entidades no identity map, relidas uma a uma pelo pydantic
+def orm_page(session: Session, size: int) -> AccountsList:
+    accounts = session.scalars(
+        select(Account).order_by(Account.id).limit(size)
+    )
+
+    return AccountsList(
+        accounts=[
+            AccountResponse.model_validate(account) for account in accounts
+        ]
+    )
+
+
+def row_page(session: Session, size: int) -> AccountsList:
+    rows = session.execute(
+        select(Account.id, Account.username, Account.email, Account.state)
+        .order_by(Account.id)
+        .limit(size)
+    )
+
+    return AccountsList.model_validate(
+        {'accounts': rows.all()}, from_attributes=True
+    )
+
+
+def run_candidate(engine, build_page, size: int, iterations: int) -> dict:
+    def page():
+        with Session(engine) as session:
+            return build_page(session, size)
+
+    page()
+
+    start = perf_counter()
+    for _ in range(iterations):
+        page()
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    page()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'rows_per_sec': size * iterations / elapsed,
+        'peak_kib': peak / 1024,
+    }
+
+
+def serialization_app(page: AccountsList) -> FastAPI:
+    app = FastAPI()
+
+    # caminho anterior: o model volta a ser validado contra o response_model,
+    # convertido pelo jsonable_encoder e só então codificado pelo json
+    @app.get('/before', response_model=AccountsList)
+    async def before():
+        return page
+
+    @app.get('/after', response_model=AccountsList)
+    async def after():
+        return ModelResponse(page)
+
+    return app
+
+
+async def requests_per_sec(app: FastAPI, path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://benchmark'
+    ) as client:
+        await client.get(path)
+
+        start = perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        return requests / (perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=(
+            'list_accounts: ORM entities vs plain rows, and response_model '
+            'serialization vs ModelResponse'
+        )
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[20, 100, 1000]
+    )
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    engine = build_engine(max(*args.sizes, args.page_size))
+
+    print(f'{"size":>5} {"path":>4} {"rows/s":>10} {"peak KiB":>9}')
+    for size in args.sizes:
+        for name, build_page in (('orm', orm_page), ('rows', row_page)):
+            result = run_candidate(engine, build_page, size, args.iterations)
+            print(
+                f'{size:>5} {name:>4} {result["rows_per_sec"]:>10.0f} '
+                f'{result["peak_kib"]:>9.1f}'
+            )
+
+    with Session(engine) as session:
+        app = serialization_app(row_page(session, args.page_size))
+
+    print(f'\n{"page":>5} {"path":>6} {"req/s":>8}')
+    for path in ('/before', '/after'):
+        rate = asyncio.run(requests_per_sec(app, path, args.requests))
+        print(f'{args.page_size:>5} {path[1:]:>6} {rate:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
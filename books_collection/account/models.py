@@ -19,6 +19,9 @@ class Account:
         default=State.enabled,
         server_default=State.enabled.value,
     )
+    security_version: Mapped[int] = mapped_column(
+        init=False, default=1, server_default='1'
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
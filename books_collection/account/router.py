@@ -13,12 +13,23 @@ from books_collection.account.schemas import (
 )
 from books_collection.account.service import (
     create_account,
+    create_accounts,
     delete_account,
     list_accounts,
     update_account,
 )
-from books_collection.auth.security import get_current_account
-from books_collection.common.dependencies import Session
+from books_collection.auth.admission import hashing_admission
+from books_collection.auth.security import (
+    get_admin_principal,
+    get_current_account,
+)
+from books_collection.common.batch import Batch, BatchResult
+from books_collection.common.dependencies import (
+    ConditionalGet,
+    ReadSession,
+    Session,
+)
+from books_collection.common.responses import ModelResponse
 
 router = APIRouter(prefix='/accounts', tags=['accounts'])
 CurrentAccount = Annotated[Account, Depends(get_current_account)]
@@ -26,15 +37,39 @@ QueryParam = Annotated[FilterAccount, Query()]
 
 
 @router.post(
-    '/', status_code=HTTPStatus.CREATED, response_model=AccountResponse
+    '/',
+    status_code=HTTPStatus.CREATED,
+    response_model=AccountResponse,
+    dependencies=[Depends(hashing_admission('register'))],
 )
 async def create(account: AccountRequest, session: Session):
-    return await create_account(account, session)
+    return ModelResponse(
+        await create_account(account, session), HTTPStatus.CREATED
+    )
+
+
+# carga vinda de sistemas upstream: restrita a administradores
+@router.post(
+    '/batch',
+    status_code=HTTPStatus.OK,
+    response_model=BatchResult[AccountResponse],
+    dependencies=[
+        Depends(get_admin_principal),
+        Depends(hashing_admission('register')),
+    ],
+)
+async def create_batch(accounts: Batch[AccountRequest], session: Session):
+    return ModelResponse(await create_accounts(accounts, session))
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=AccountsList)
-async def list(filters: QueryParam, session: Session):
-    return await list_accounts(filters, session)
+async def list(
+    filters: QueryParam, session: ReadSession, conditional: ConditionalGet
+):
+    return ModelResponse(
+        await list_accounts(filters, session, conditional),
+        headers=conditional.headers(),
+    )
 
 
 @router.patch(
@@ -46,7 +81,9 @@ async def update(
     account: CurrentAccount,
     session: Session,
 ):
-    return await update_account(id, account_update, account, session)
+    return ModelResponse(
+        await update_account(id, account_update, account, session)
+    )
 
 
 @router.delete('/{id}', status_code=HTTPStatus.NO_CONTENT)
@@ -21,7 +21,8 @@ class AccountRequest(BaseModel):
 class AccountResponse(BaseModel):
     id: int
     username: str
-    email: EmailStr
+    # já validado na entrada; revalidar na saída custa ~0.3ms por linha
+    email: str
     state: State
 
     model_config = ConfigDict(from_attributes=True)
@@ -36,6 +37,7 @@ class AccountUpdate(BaseModel):
 
 class AccountsList(BaseModel):
     accounts: list[AccountResponse]
+    next_cursor: Optional[str] = Field(default=None)
 
 
 class FilterAccount(FilterPage):
@@ -1,9 +1,11 @@
-from dataclasses import asdict
+from http import HTTPStatus
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from books_collection.account.enums import State
 from books_collection.account.models import Account
 from books_collection.account.schemas import (
     AccountRequest,
@@ -12,57 +14,172 @@ from books_collection.account.schemas import (
     AccountUpdate,
     FilterAccount,
 )
-from books_collection.auth.security import hash_password
+from books_collection.auth.hashing import hashing_pool
+from books_collection.auth.principal import principal_cache
+from books_collection.common.batch import (
+    BatchReport,
+    BatchResult,
+    first_by_key,
+)
+from books_collection.common.conditional import Conditional
 from books_collection.common.exception.errors import (
     DuplicatedRegistry,
     ForbidenOperation,
+    RegistryNotFound,
+)
+from books_collection.common.pagination import keyset, split_page
+from books_collection.common.statements import (
+    constraint_name,
+    update_returning,
 )
 
 
 async def create_account(
     account: AccountRequest, session: AsyncSession
 ) -> AccountResponse:
-    new_account = Account(
-        username=account.username,
-        email=account.email,
-        password=hash_password(account.password),
+    password = await hashing_pool.hash(account.password)
+
+    # um único round-trip: conflito volta como nenhuma linha, sem
+    # exceção nem rollback
+    result = await session.execute(
+        insert(Account)
+        .values(
+            username=account.username,
+            email=account.email,
+            password=password,
+        )
+        .on_conflict_do_nothing()
+        .returning(Account.id, Account.username, Account.email, Account.state)
     )
-    try:
+    new_account = result.first()
+    if new_account is None:
+        await raise_account_conflict(account.username, account.email, session)
 
-        session.add(new_account)
-        await session.commit()
-        await session.refresh(new_account)
-
-        return AccountResponse(**asdict(new_account))
-    except IntegrityError as ex:
-        await session.rollback()
+    await session.commit()
+    return AccountResponse.model_validate(new_account)
 
-        error_detail = str(ex.orig)
-        if 'accounts_username_key' in error_detail:
-            exc_msg = f'username: {account.username} is already in use'
-            raise DuplicatedRegistry(exc_msg)
 
-        if 'accounts_email_key' in error_detail:
-            exc_msg = f'email: {account.email} is already in use'
-            raise DuplicatedRegistry(exc_msg)
+# só no caminho de conflito: descobre qual campo único já está em uso
+async def raise_account_conflict(
+    username: str | None, email: str | None, session: AsyncSession
+):
+    result = await session.execute(
+        select(Account.username, Account.email)
+        .where(or_(Account.username == username, Account.email == email))
+        .limit(1)
+    )
+    in_use = result.first()
+
+    if in_use and in_use.username == username:
+        raise DuplicatedRegistry(f'username: {username} is already in use')
+
+    if in_use and in_use.email == email:
+        raise DuplicatedRegistry(f'email: {email} is already in use')
+
+    raise DuplicatedRegistry('username or email is already in use')
+
+
+async def create_accounts(
+    accounts: list[AccountRequest], session: AsyncSession
+) -> BatchResult[AccountResponse]:
+    report = BatchReport(AccountResponse, len(accounts))
+    pending = first_by_key(report, accounts, 'username', 'email')
+
+    passwords = await hashing_pool.hash_many([
+        account.password for account in pending.values()
+    ])
+    result = await session.execute(
+        insert(Account)
+        .on_conflict_do_nothing()
+        .returning(Account.id, Account.username, Account.email, Account.state),
+        [
+            {
+                'username': account.username,
+                'email': account.email,
+                'password': password,
+            }
+            for account, password in zip(pending.values(), passwords)
+        ],
+    )
+    created = {row.username: row for row in result}
+
+    # uma única consulta explica todos os conflitos do lote
+    rejected = [
+        account
+        for account in pending.values()
+        if account.username not in created
+    ]
+    in_use = {'username': set(), 'email': set()}
+    if rejected:
+        usernames = [account.username for account in rejected]
+        emails = [account.email for account in rejected]
+        result = await session.execute(
+            select(Account.username, Account.email).where(
+                or_(Account.username.in_(usernames), Account.email.in_(emails))
+            )
+        )
+        for row in result:
+            in_use['username'].add(row.username)
+            in_use['email'].add(row.email)
+    await session.commit()
 
-        raise DuplicatedRegistry('username or email is already in use')
+    for index, account in pending.items():
+        row = created.get(account.username)
+        if row is not None:
+            report.created(index, AccountResponse.model_validate(row))
+        elif account.username in in_use['username']:
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                f'username: {account.username} is already in use',
+            )
+        elif account.email in in_use['email']:
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                f'email: {account.email} is already in use',
+            )
+        else:
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                'username or email is already in use',
+            )
+
+    return report.result()
 
 
 # TODO: renomear query para filter chatão!
 async def list_accounts(
-    query: FilterAccount, session: AsyncSession
+    query: FilterAccount,
+    session: AsyncSession,
+    conditional: Conditional | None = None,
 ) -> AccountsList:
-    sql_query = select(Account).offset(query.offset).limit(query.limit)
+    sql_query = keyset(
+        select(
+            Account.id,
+            Account.username,
+            Account.email,
+            Account.state,
+            Account.updated_at,
+        ),
+        query,
+        Account.id,
+    )
 
     if query.state:
         sql_query = sql_query.filter(Account.state == query.state)
 
-    result = await session.scalars(sql_query)
+    result = await session.execute(sql_query)
 
-    accounts = result.all()
+    rows, next_cursor = split_page(result.all(), query, lambda row: (row.id,))
+    if conditional:
+        conditional.validate(rows, next_cursor)
 
-    return AccountsList(accounts=accounts)
+    # linhas puras (sem identity map) validadas numa única passada
+    return AccountsList.model_validate(
+        {'accounts': rows, 'next_cursor': next_cursor}, from_attributes=True
+    )
 
 
 async def update_account(
@@ -75,28 +192,49 @@ async def update_account(
     if account.id != id:
         raise ForbidenOperation('not enough permissions to update account')
 
-    for key, value in account_update.model_dump(exclude_unset=True).items():
-        setattr(account, key, value)
+    values = account_update.model_dump(exclude_unset=True)
+    if 'password' in values:
+        values['password'] = await hashing_pool.hash(values['password'])
+
+    # troca de senha ou desativação invalida os tokens já emitidos
+    if 'password' in values or (
+        values.get('state') == State.disabled
+        and account.state != State.disabled
+    ):
+        values['security_version'] = Account.security_version + 1
 
     try:
+        updated = await update_returning(
+            session,
+            Account,
+            id,
+            values,
+            Account.id,
+            Account.username,
+            Account.email,
+            Account.state,
+        )
         await session.commit()
-        await session.refresh(account)
-
-        return AccountResponse(**asdict(account))
     except IntegrityError as ex:
         await session.rollback()
 
-        error_detail = str(ex.orig)
-        if 'accounts_username_key' in error_detail:
+        constraint = constraint_name(ex)
+        if constraint == 'accounts_username_key':
             exc_msg = f'username: {account_update.username} is already in use'
             raise DuplicatedRegistry(exc_msg)
 
-        if 'accounts_email_key' in error_detail:
+        if constraint == 'accounts_email_key':
             exc_msg = f'email: {account_update.email} is already in use'
             raise DuplicatedRegistry(exc_msg)
 
         raise DuplicatedRegistry('username or email is already in use')
 
+    principal_cache.evict(id)
+    if updated is None:
+        raise RegistryNotFound('account not found')
+
+    return AccountResponse.model_validate(updated)
+
 
 async def delete_account(
     id: int, account: Account, session: AsyncSession
@@ -105,3 +243,4 @@ async def delete_account(
         raise ForbidenOperation('not enough permissions to delete account')
     await session.delete(account)
     await session.commit()
+    principal_cache.evict(account.id)
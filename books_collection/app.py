@@ -1,22 +1,102 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
 from books_collection.account import router as account
 from books_collection.auth import router as auth
+from books_collection.auth.hashing import hashing_pool
+from books_collection.auth.principal import principal_cache
+from books_collection.auth.revocation import (
+    revocation_list,
+    sync_revocation_list,
+)
 from books_collection.book import router as book
+from books_collection.catalog import router as catalog
 from books_collection.common.exception.exception_handler import (
     exception_handlers,
 )
+from books_collection.common.rate_limit import rate_limiter
+from books_collection.common.response_cache import response_cache
+from books_collection.common.responses import ModelResponse
+from books_collection.database.config import (
+    mark_write,
+    pool_stats,
+    replica_engine,
+    session_factory,
+)
 from books_collection.novelist import router as novelist
+from books_collection.search import router as search
+from books_collection.search.autocomplete import (
+    load_prefix_index,
+    prefix_index,
+    sync_prefix_index,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with session_factory() as session:
+        await revocation_list.rebuild(session)
+        await load_prefix_index(session)
+    revocation_sync = asyncio.create_task(sync_revocation_list())
+    prefix_index_sync = asyncio.create_task(sync_prefix_index())
+
+    yield
+
+    revocation_sync.cancel()
+    prefix_index_sync.cancel()
+    hashing_pool.shutdown()
+
+
+# rotas que ainda devolvem dicts também são codificadas pelo orjson
+app = FastAPI(
+    default_response_class=ModelResponse,
+    exception_handlers=exception_handlers,
+    lifespan=lifespan,
+)
+
+
+@app.middleware('http')
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+
+    if (
+        replica_engine is not None
+        and request.method in {'POST', 'PUT', 'PATCH', 'DELETE'}
+        and response.status_code < HTTPStatus.BAD_REQUEST
+    ):
+        mark_write(response)
+
+    return response
 
-app = FastAPI(exception_handlers=exception_handlers)
 
 app.include_router(account.router)
 app.include_router(auth.router)
 app.include_router(book.router)
+app.include_router(catalog.router)
 app.include_router(novelist.router)
+app.include_router(search.router)
+app.include_router(search.autocomplete_router)
 
 
 @app.get('/health')
 def healch_check():
     return JSONResponse(content={'status': 'Up'})
+
+
+@app.get('/metrics')
+def metrics():
+    return JSONResponse(
+        content={
+            'autocomplete': prefix_index.stats(),
+            'database_pool': pool_stats(),
+            'hashing': hashing_pool.stats(),
+            'principal_cache': principal_cache.stats(),
+            'rate_limit': rate_limiter.stats(),
+            'response_cache': response_cache.stats(),
+            'revocation_list': revocation_list.stats(),
+        }
+    )
@@ -0,0 +1,28 @@
+from fastapi import Request
+
+from books_collection.auth.hashing import hashing_pool
+from books_collection.common.exception.errors import (
+    ServiceOverloaded,
+    TooManyRequests,
+)
+from books_collection.common.rate_limit import (
+    rate_limiter,
+    retry_after_header,
+)
+
+
+def hashing_admission(scope: str):
+    async def admit(request: Request):
+        client = request.client.host if request.client else 'unknown'
+
+        retry_after = rate_limiter.acquire(f'{scope}:{client}')
+        if retry_after:
+            raise TooManyRequests(
+                'too many requests',
+                retry_after=retry_after_header(retry_after),
+            )
+
+        if hashing_pool.is_saturated():
+            raise ServiceOverloaded('password hashing is overloaded')
+
+    return admit
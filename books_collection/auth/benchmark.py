@@ -0,0 +1,96 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from os import cpu_count
+from statistics import quantiles
+from time import perf_counter
+
+from books_collection.auth.hashing import build_context
+from books_collection.settings import settings
+
+PLAIN_PASSWORD = 'benchmark@password'
+
+
+def run_candidate(
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    iterations: int,
+    workers: int,
+) -> dict:
+    context = build_context(time_cost, memory_cost, parallelism)
+    hashed_password = context.hash(PLAIN_PASSWORD)
+
+    def timed_verify(_):
+        start = perf_counter()
+        context.verify(PLAIN_PASSWORD, hashed_password)
+        return perf_counter() - start
+
+    with ThreadPoolExecutor(workers) as executor:
+        start = perf_counter()
+        list(executor.map(context.hash, [PLAIN_PASSWORD] * iterations))
+        hash_elapsed = perf_counter() - start
+
+        latencies = list(executor.map(timed_verify, range(iterations)))
+
+    percentiles = quantiles(latencies, n=100, method='inclusive')
+
+    return {
+        'time_cost': time_cost,
+        'memory_cost': memory_cost,
+        'parallelism': parallelism,
+        'hashes_per_sec': iterations / hash_elapsed,
+        'verify_p50_ms': percentiles[49] * 1000,
+        'verify_p99_ms': percentiles[98] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='argon2 cost tuning benchmark for this machine'
+    )
+    parser.add_argument(
+        '--time-cost', type=int, nargs='+', default=[settings.ARGON2_TIME_COST]
+    )
+    parser.add_argument(
+        '--memory-cost',
+        type=int,
+        nargs='+',
+        default=[settings.ARGON2_MEMORY_COST],
+        help='memory cost in KiB',
+    )
+    parser.add_argument(
+        '--parallelism',
+        type=int,
+        nargs='+',
+        default=[settings.ARGON2_PARALLELISM],
+    )
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=settings.HASHING_MAX_WORKERS,
+        help='concurrent hashing workers, as in HASHING_MAX_WORKERS',
+    )
+    args = parser.parse_args(argv)
+
+    print(f'cpus: {cpu_count()} workers: {args.workers}')
+    print(
+        f'{"time":>5} {"memory":>8} {"par":>4} '
+        f'{"hashes/s":>10} {"p50 ms":>9} {"p99 ms":>9}'
+    )
+    for time_cost, memory_cost, parallelism in product(
+        args.time_cost, args.memory_cost, args.parallelism
+    ):
+        result = run_candidate(
+            time_cost, memory_cost, parallelism, args.iterations, args.workers
+        )
+        print(
+            f'{result["time_cost"]:>5} {result["memory_cost"]:>8} '
+            f'{result["parallelism"]:>4} {result["hashes_per_sec"]:>10.1f} '
+            f'{result["verify_p50_ms"]:>9.2f} {result["verify_p99_ms"]:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
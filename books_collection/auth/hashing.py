@@ -0,0 +1,151 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from time import perf_counter
+
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from books_collection.common.exception.errors import ServiceOverloaded
+from books_collection.settings import settings
+
+
+def build_context(
+    time_cost: int = settings.ARGON2_TIME_COST,
+    memory_cost: int = settings.ARGON2_MEMORY_COST,
+    parallelism: int = settings.ARGON2_PARALLELISM,
+) -> PasswordHash:
+    return PasswordHash((
+        Argon2Hasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        ),
+    ))
+
+
+context = build_context()
+
+
+def hash_password(plain_password: str):
+    return context.hash(plain_password)
+
+
+def verify_password(plain_password: str, hashed_password: str):
+    return context.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return context.current_hasher.check_needs_rehash(hashed_password)
+
+
+# argon2 é CPU bound: roda fora do event loop e rejeita chamadas além de
+# max_queue_depth (em execução + aguardando) ao invés de enfileirar.
+class HashingPool:
+    def __init__(self, executor: str, max_workers: int, max_queue_depth: int):
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._metrics = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'peak_in_flight': 0,
+            'total_latency_secs': 0.0,
+        }
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == 'process':
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='hashing'
+                )
+        return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def is_saturated(self) -> bool:
+        return self._in_flight >= self.max_queue_depth
+
+    async def hash(self, plain_password: str) -> str:
+        return await self._run(hash_password, plain_password)
+
+    # lotes usam no máximo max_workers vagas por vez: hashes em paralelo sem
+    # estourar max_queue_depth e derrubar os logins concorrentes
+    async def hash_many(self, plain_passwords: list[str]) -> list[str]:
+        slots = asyncio.Semaphore(self.max_workers)
+
+        async def hash_one(plain_password: str) -> str:
+            async with slots:
+                return await self.hash(plain_password)
+
+        return await asyncio.gather(*map(hash_one, plain_passwords))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            verify_password, plain_password, hashed_password
+        )
+
+    async def _run(self, func, *args):
+        if self.is_saturated():
+            self._metrics['rejected'] += 1
+            raise ServiceOverloaded('password hashing is overloaded')
+
+        self._in_flight += 1
+        self._metrics['submitted'] += 1
+        self._metrics['peak_in_flight'] = max(
+            self._metrics['peak_in_flight'], self._in_flight
+        )
+        start = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, func, *args)
+            self._metrics['completed'] += 1
+            return result
+        except Exception:
+            self._metrics['failed'] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._metrics['total_latency_secs'] += perf_counter() - start
+
+    def stats(self) -> dict:
+        finished = self._metrics['completed'] + self._metrics['failed']
+        total_latency = self._metrics['total_latency_secs']
+        return {
+            'executor': self.executor_type,
+            'max_workers': self.max_workers,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight': self._in_flight,
+            'submitted': self._metrics['submitted'],
+            'completed': self._metrics['completed'],
+            'failed': self._metrics['failed'],
+            'rejected': self._metrics['rejected'],
+            'peak_in_flight': self._metrics['peak_in_flight'],
+            'avg_latency_ms': (
+                round(total_latency / finished * 1000, 3) if finished else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    executor=settings.HASHING_EXECUTOR,
+    max_workers=settings.HASHING_MAX_WORKERS,
+    max_queue_depth=settings.HASHING_MAX_QUEUE_DEPTH,
+)
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from books_collection.database.tables import table_registry
+
+
+@table_registry.mapped_as_dataclass
+class RevokedToken:
+    __tablename__ = 'revoked_tokens'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    jti: Mapped[str] = mapped_column(unique=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
+    account_id: Mapped[int | None] = mapped_column(
+        ForeignKey('accounts.id', ondelete='CASCADE'), default=None
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
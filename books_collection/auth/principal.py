@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+
+from books_collection.account.enums import State
+from books_collection.account.models import Account
+from books_collection.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    email: str
+    username: str
+    state: State
+    version: int
+
+    @classmethod
+    def from_account(cls, account: Account) -> 'Principal':
+        return cls(
+            id=account.id,
+            email=account.email,
+            username=account.username,
+            state=account.state,
+            version=account.security_version,
+        )
+
+    def claims(self) -> dict:
+        return {'sub': self.email, 'uid': self.id, 'ver': self.version}
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_secs: int, clock=monotonic):
+        self.max_size = max_size
+        self.ttl_secs = ttl_secs
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Principal]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, account_id: int) -> Principal | None:
+        entry = self._entries.get(account_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= self._clock():
+            del self._entries[account_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(account_id)
+        self.hits += 1
+        return principal
+
+    def set(self, account_id: int, principal: Principal) -> None:
+        self._entries[account_id] = (self._clock() + self.ttl_secs, principal)
+        self._entries.move_to_end(account_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, account_id: int) -> None:
+        if self._entries.pop(account_id, None) is not None:
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_secs': self.ttl_secs,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_secs=settings.PRINCIPAL_CACHE_TTL_SECS,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from time import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from books_collection.auth.models import RevokedToken
+from books_collection.database.config import session_factory
+from books_collection.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# espelho em memória da tabela revoked_tokens: a checagem por request é
+# apenas um lookup no dict, sem I/O. Cada refresh relê todas as revogações
+# ainda válidas (conjunto pequeno, podado a cada ciclo): um polling por
+# id > último visto perderia uma linha de id menor com commit mais tardio.
+class RevocationList:
+    def __init__(self, clock=time):
+        self._clock = clock
+        self._revoked: dict[str, float] = {}
+        self._refreshed_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+
+        if expires_at <= self._clock():
+            del self._revoked[jti]
+            return False
+
+        return True
+
+    def add(self, jti: str, expires_at: float) -> None:
+        if expires_at > self._clock():
+            self._revoked[jti] = expires_at
+
+    def prune(self) -> None:
+        now = self._clock()
+        self._revoked = {
+            jti: expires_at
+            for jti, expires_at in self._revoked.items()
+            if expires_at > now
+        }
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._refreshed_at = 0.0
+
+    async def refresh(self, session: AsyncSession) -> None:
+        now = self._clock()
+        rows = await session.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at).where(
+                RevokedToken.expires_at
+                > datetime.fromtimestamp(now, tz=timezone.utc)
+            )
+        )
+
+        for jti, expires_at in rows:
+            self.add(jti, expires_at.timestamp())
+
+        self.prune()
+        self._refreshed_at = now
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        self.clear()
+        await self.refresh(session)
+
+    def stats(self) -> dict:
+        return {'size': len(self._revoked), 'refreshed_at': self._refreshed_at}
+
+
+revocation_list = RevocationList()
+
+
+async def revoke_token(
+    session: AsyncSession,
+    jti: str,
+    expires_at: float,
+    account_id: int | None = None,
+) -> None:
+    await session.execute(
+        insert(RevokedToken)
+        .values(
+            jti=jti,
+            expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+            account_id=account_id,
+        )
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    await session.commit()
+
+    revocation_list.add(jti, expires_at)
+
+
+async def prune_revoked_tokens(session: AsyncSession) -> None:
+    await session.execute(
+        delete(RevokedToken).where(
+            RevokedToken.expires_at <= datetime.now(tz=timezone.utc)
+        )
+    )
+    await session.commit()
+
+
+async def sync_revocation_list() -> None:
+    while True:
+        await asyncio.sleep(settings.REVOCATION_REFRESH_SECS)
+        try:
+            async with session_factory() as session:
+                await revocation_list.refresh(session)
+                await prune_revoked_tokens(session)
+        except Exception:
+            # banco indisponível: mantém o espelho atual e tenta de novo
+            logger.exception('revocation list sync failed')
@@ -1,33 +1,51 @@
 from http import HTTPStatus
+from time import time
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 
 from books_collection.account.models import Account
-from books_collection.auth.schemas import Token
+from books_collection.auth.admission import hashing_admission
+from books_collection.auth.hashing import hashing_pool, needs_rehash
+from books_collection.auth.principal import Principal, principal_cache
+from books_collection.auth.revocation import revoke_token
+from books_collection.auth.schemas import RevokeRequest, Token
 from books_collection.auth.security import (
     create_access_token,
-    get_current_account,
-    verify_password,
+    decode_token,
+    get_admin_principal,
+    get_current_principal,
+    oauth2_schema,
 )
+from books_collection.auth.service import rehash_password, revoke_account
 from books_collection.common.dependencies import Session
+from books_collection.settings import settings
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
-CurrentAccount = Annotated[Account, Depends(get_current_account)]
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+AdminPrincipal = Annotated[Principal, Depends(get_admin_principal)]
+BearerToken = Annotated[str, Depends(oauth2_schema)]
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 
 
-@router.post('/token', status_code=HTTPStatus.OK, response_model=Token)
-async def login(form_data: OAuth2Form, session: Session):
+@router.post(
+    '/token',
+    status_code=HTTPStatus.OK,
+    response_model=Token,
+    dependencies=[Depends(hashing_admission('login'))],
+)
+async def login(
+    form_data: OAuth2Form, session: Session, background_tasks: BackgroundTasks
+):
     db_account = await session.scalar(
         select(Account).where(Account.email == form_data.username)
     )
 
-    if not db_account or not verify_password(
+    if not db_account or not await hashing_pool.verify(
         form_data.password, db_account.password
     ):
         raise HTTPException(
@@ -35,13 +53,50 @@ async def login(form_data: OAuth2Form, session: Session):
             detail='invalid username or password',
         )
 
-    token, expires_in = create_access_token({'sub': form_data.username})
+    if needs_rehash(db_account.password):
+        background_tasks.add_task(
+            rehash_password,
+            db_account.id,
+            form_data.password,
+            db_account.password,
+        )
+
+    principal = Principal.from_account(db_account)
+    principal_cache.set(principal.id, principal)
+
+    token, expires_in = create_access_token(principal.claims())
 
     return Token(access_token=token, expires_in=expires_in)
 
 
 @router.post('/refresh_token', status_code=HTTPStatus.OK, response_model=Token)
-def refresh_token(account: CurrentAccount):
-    token, expires_in = create_access_token({'sub': account.email})
+def refresh_token(principal: CurrentPrincipal):
+    token, expires_in = create_access_token(principal.claims())
 
     return Token(access_token=token, expires_in=expires_in)
+
+
+@router.post('/logout', status_code=HTTPStatus.NO_CONTENT)
+async def logout(
+    principal: CurrentPrincipal, token: BearerToken, session: Session
+):
+    decoded_token = decode_token(token)
+    if decoded_token.get('jti'):
+        await revoke_token(
+            session,
+            decoded_token['jti'],
+            decoded_token['exp'],
+            account_id=principal.id,
+        )
+
+
+@router.post('/revoke', status_code=HTTPStatus.NO_CONTENT)
+async def revoke(
+    revoke_request: RevokeRequest, admin: AdminPrincipal, session: Session
+):
+    if revoke_request.jti:
+        # o exp do token é desconhecido: usa o maior tempo de vida possível
+        expires_at = time() + settings.TOKEN_TIME_EXPIRATION_SECS
+        await revoke_token(session, revoke_request.jti, expires_at)
+    else:
+        await revoke_account(revoke_request.account_id, session)
@@ -1,7 +1,20 @@
-from pydantic import BaseModel, Field
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class Token(BaseModel):
     access_token: str
     expires_in: int
     token_type: str = Field(default='Bearer')
+
+
+class RevokeRequest(BaseModel):
+    jti: Optional[str] = Field(default=None)
+    account_id: Optional[int] = Field(default=None, gt=0)
+
+    @model_validator(mode='after')
+    def check_target(self):
+        if (self.jti is None) == (self.account_id is None):
+            raise ValueError('inform either jti or account_id')
+        return self
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from http import HTTPStatus
+from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends
@@ -7,66 +8,120 @@ from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import decode, encode
 from jwt.exceptions import InvalidTokenError
-from pwdlib import PasswordHash
 from sqlalchemy import select
 
 from books_collection.account.models import Account
+from books_collection.auth.principal import Principal, principal_cache
+from books_collection.auth.revocation import revocation_list
 from books_collection.common.dependencies import Session
+from books_collection.common.exception.errors import ForbidenOperation
 from books_collection.settings import settings
 
-context = PasswordHash.recommended()
-
 oauth2_schema = OAuth2PasswordBearer(
     tokenUrl='/auth/token', refreshUrl='/auth/refresh_token'
 )
 
 
-def hash_password(plain_password: str):
-    return context.hash(plain_password)
-
-
-def verify_password(plain_password: str, hashed_password: str):
-    return context.verify(plain_password, hashed_password)
-
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expires_in = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
         seconds=settings.TOKEN_TIME_EXPIRATION_SECS
     )
-    to_encode.update({'exp': expires_in})
+    to_encode.update({'exp': expires_in, 'jti': uuid4().hex})
 
     token = encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
 
     return token, int(expires_in.timestamp())
 
 
-async def get_current_account(
-    session: Session,
-    token: str = Depends(oauth2_schema),
-):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+
+def decode_token(token: str) -> dict:
     try:
         decoded_token = decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        email = decoded_token.get('sub')
-
-        if not email:
-            raise credentials_exception
     except InvalidTokenError:
-        raise credentials_exception
+        raise credentials_exception()
+
+    if not decoded_token.get('sub'):
+        raise credentials_exception()
 
-    db_account = await session.scalar(
-        select(Account).where(Account.email == email)
+    jti = decoded_token.get('jti')
+    if jti and revocation_list.is_revoked(jti):
+        raise credentials_exception()
+
+    return decoded_token
+
+
+async def get_current_principal(
+    session: Session,
+    token: str = Depends(oauth2_schema),
+) -> Principal:
+    decoded_token = decode_token(token)
+    email = decoded_token.get('sub')
+
+    account_id = decoded_token.get('uid')
+    # tokens emitidos antes do claim `ver` equivalem à versão inicial
+    version = decoded_token.get('ver', 1)
+
+    principal = principal_cache.get(account_id) if account_id else None
+    if principal and principal.version == version:
+        return principal
+
+    principal_query = select(
+        Account.id,
+        Account.email,
+        Account.username,
+        Account.state,
+        Account.security_version.label('version'),
     )
+    if account_id:
+        principal_query = principal_query.where(Account.id == account_id)
+    else:
+        principal_query = principal_query.where(Account.email == email)
+
+    row = (await session.execute(principal_query)).first()
+
+    if not row:
+        if account_id:
+            principal_cache.evict(account_id)
+        raise credentials_exception()
+
+    principal = Principal(**row._asdict())
+    principal_cache.set(principal.id, principal)
+
+    if principal.version != version:
+        raise credentials_exception()
+
+    return principal
+
+
+async def get_current_account(
+    session: Session,
+    token: str = Depends(oauth2_schema),
+):
+    principal = await get_current_principal(session, token)
+
+    db_account = await session.get(Account, principal.id)
 
     if not db_account:
-        raise credentials_exception
+        principal_cache.evict(principal.id)
+        raise credentials_exception()
 
     return db_account
+
+
+async def get_admin_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    if principal.email not in settings.ADMIN_EMAILS:
+        raise ForbidenOperation('not enough permissions to revoke tokens')
+
+    return principal
@@ -0,0 +1,43 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from books_collection.account.models import Account
+from books_collection.auth.hashing import hashing_pool
+from books_collection.auth.principal import principal_cache
+from books_collection.common.exception.errors import (
+    RegistryNotFound,
+    ServiceOverloaded,
+)
+from books_collection.database.config import session_factory
+
+
+async def rehash_password(
+    account_id: int, plain_password: str, current_hash: str
+) -> None:
+    try:
+        new_hash = await hashing_pool.hash(plain_password)
+    except ServiceOverloaded:
+        # tenta novamente no próximo login
+        return
+
+    async with session_factory() as session:
+        await session.execute(
+            update(Account)
+            .where(Account.id == account_id, Account.password == current_hash)
+            .values(password=new_hash)
+        )
+        await session.commit()
+
+
+async def revoke_account(account_id: int, session: AsyncSession) -> None:
+    revoked_id = await session.scalar(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(security_version=Account.security_version + 1)
+        .returning(Account.id)
+    )
+    if not revoked_id:
+        raise RegistryNotFound('account not found')
+
+    await session.commit()
+    principal_cache.evict(account_id)
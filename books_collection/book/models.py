@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import Computed, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from books_collection.database.tables import table_registry
@@ -11,14 +12,32 @@ from books_collection.database.tables import table_registry
 @table_registry.mapped_as_dataclass
 class Book:
     __tablename__ = 'books'
+    __table_args__ = (
+        Index('ix_books_novelist_id_year', 'novelist_id', 'year'),
+        Index(
+            'ix_books_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     year: Mapped[int]
     title: Mapped[str] = mapped_column(unique=True)
-    novelist_id: Mapped[int] = mapped_column(ForeignKey('novelists.id'))
+    novelist_id: Mapped[int] = mapped_column(
+        ForeignKey('novelists.id', ondelete='CASCADE')
+    )
 
     novelist: Mapped['Novelist'] = relationship(  # noqa: F821 # type: ignore
-        init=False, back_populates='books', lazy='joined'
+        init=False, back_populates='books', lazy='raise'
+    )
+
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', title)", persisted=True),
+        init=False,
+        repr=False,
+        compare=False,
+        deferred=True,
+        deferred_raiseload=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
@@ -1,3 +1,77 @@
-from fastapi import APIRouter
+from http import HTTPStatus
+from typing import Annotated, Literal, Optional
 
-router = APIRouter(prefix='/books', tags=['books'])
+from fastapi import APIRouter, Depends, Query
+
+from books_collection.auth.security import get_current_principal
+from books_collection.book.schemas import (
+    BookList,
+    BookRequest,
+    BookResponse,
+    BookUpdate,
+    FilterBook,
+)
+from books_collection.book.service import (
+    create_book,
+    create_books,
+    delete_book,
+    get_book,
+    list_books,
+    update_book,
+)
+from books_collection.common.batch import Batch, BatchResult
+from books_collection.common.dependencies import (
+    CachedResponse,
+    ReadSession,
+    Session,
+)
+from books_collection.common.responses import ModelResponse
+
+router = APIRouter(
+    prefix='/books',
+    tags=['books'],
+    dependencies=[Depends(get_current_principal)],
+)
+
+QueryParam = Annotated[FilterBook, Query()]
+
+
+@router.post('/', status_code=HTTPStatus.CREATED, response_model=BookResponse)
+async def create(book: BookRequest, session: Session):
+    return ModelResponse(await create_book(book, session), HTTPStatus.CREATED)
+
+
+@router.post(
+    '/batch',
+    status_code=HTTPStatus.OK,
+    response_model=BatchResult[BookResponse],
+)
+async def create_batch(books: Batch[BookRequest], session: Session):
+    return ModelResponse(await create_books(books, session))
+
+
+@router.get('/', status_code=HTTPStatus.OK, response_model=BookList)
+async def list(filters: QueryParam, cache: CachedResponse):
+    return await cache.serve(
+        'books',
+        lambda session, conditional: list_books(filters, session, conditional),
+    )
+
+
+@router.get('/{id}', status_code=HTTPStatus.OK, response_model=BookResponse)
+async def get(
+    id: int,
+    session: ReadSession,
+    expand: Optional[Literal['novelist']] = None,
+):
+    return ModelResponse(await get_book(id, session, expand))
+
+
+@router.patch('/{id}', status_code=HTTPStatus.OK, response_model=BookResponse)
+async def update(id: int, book: BookUpdate, session: Session):
+    return ModelResponse(await update_book(id, book, session))
+
+
+@router.delete('/{id}', status_code=HTTPStatus.NO_CONTENT)
+async def delete(id: int, session: Session):
+    await delete_book(id, session)
@@ -1,17 +1,51 @@
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from books_collection.common.filters import FilterPage
+from books_collection.novelist.schemas import NovelistResponse
 
 
 class BookRequest(BaseModel):
-    year: int = Field(max_length=4, min_length=4)
+    year: int = Field(ge=1000, le=9999)
     title: str = Field(min_length=5)
-    novelistId: int = Field(gt=0)
+    novelist_id: int = Field(gt=0, alias='novelistId')
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class BookResponse(BookRequest):
     id: int = Field(gt=0)
+    novelist: Optional[NovelistResponse] = Field(default=None)
+
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
 
 class BookUpdate(BaseModel):
-    year: int = Field(max_length=4, min_length=4)
-    title: str = Field(min_length=5)
-    novelistId: int = Field(gt=0)
+    year: Optional[int] = Field(default=None, ge=1000, le=9999)
+    title: Optional[str] = Field(default=None, min_length=5)
+    novelist_id: Optional[int] = Field(default=None, gt=0, alias='novelistId')
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BookList(BaseModel):
+    books: list[BookResponse]
+    next_cursor: Optional[str] = Field(default=None)
+
+
+class FilterBook(FilterPage):
+    novelist_id: Optional[int] = Field(default=None, gt=0)
+    year_from: Optional[int] = Field(default=None)
+    year_to: Optional[int] = Field(default=None)
+    expand: Optional[Literal['novelist']] = Field(default=None)
+
+    @model_validator(mode='after')
+    def check_year_range(self):
+        if (
+            self.year_from is not None
+            and self.year_to is not None
+            and self.year_from > self.year_to
+        ):
+            raise ValueError('year_from must not be greater than year_to')
+        return self
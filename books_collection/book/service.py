@@ -0,0 +1,221 @@
+from http import HTTPStatus
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from books_collection.book.models import Book
+from books_collection.book.schemas import (
+    BookList,
+    BookRequest,
+    BookResponse,
+    BookUpdate,
+    FilterBook,
+)
+from books_collection.common.batch import (
+    BatchReport,
+    BatchResult,
+    first_by_key,
+)
+from books_collection.common.conditional import Conditional
+from books_collection.common.exception.errors import (
+    DuplicatedRegistry,
+    RegistryNotFound,
+)
+from books_collection.common.pagination import keyset, split_page
+from books_collection.common.response_cache import response_cache
+from books_collection.common.responses import to_response
+from books_collection.common.statements import (
+    constraint_name,
+    update_returning,
+)
+from books_collection.novelist.models import Novelist
+from books_collection.search.autocomplete import prefix_index
+
+
+def raise_integrity_error(ex: IntegrityError, title: str | None):
+    constraint = constraint_name(ex)
+    if constraint == 'books_title_key':
+        raise DuplicatedRegistry(f'title: {title} is already in use')
+
+    if constraint == 'books_novelist_id_fkey':
+        raise RegistryNotFound('novelist not found')
+
+    raise DuplicatedRegistry('duplicated registry error')
+
+
+async def create_book(
+    book: BookRequest, session: AsyncSession
+) -> BookResponse:
+    new_book = Book(
+        year=book.year, title=book.title, novelist_id=book.novelist_id
+    )
+
+    try:
+        session.add(new_book)
+        await session.commit()
+    except IntegrityError as ex:
+        await session.rollback()
+        raise_integrity_error(ex, book.title)
+
+    prefix_index.add(
+        'book', new_book.id, new_book.title, novelist_id=new_book.novelist_id
+    )
+    response_cache.invalidate('books')
+
+    return to_response(BookResponse, new_book)
+
+
+# romancistas inexistentes são separados antes do INSERT, já que uma violação
+# de FK abortaria o lote inteiro
+async def create_books(
+    books: list[BookRequest], session: AsyncSession
+) -> BatchResult[BookResponse]:
+    report = BatchReport(BookResponse, len(books))
+    pending = first_by_key(report, books, 'title')
+
+    novelist_ids = {book.novelist_id for book in pending.values()}
+    known = set(
+        await session.scalars(
+            select(Novelist.id).where(Novelist.id.in_(novelist_ids))
+        )
+    )
+    for index, book in list(pending.items()):
+        if book.novelist_id not in known:
+            report.failed(index, HTTPStatus.NOT_FOUND, 'novelist not found')
+            del pending[index]
+
+    created = {}
+    if pending:
+        try:
+            result = await session.execute(
+                insert(Book)
+                .on_conflict_do_nothing(index_elements=[Book.title])
+                .returning(Book.id, Book.title, Book.year, Book.novelist_id),
+                [
+                    book.model_dump(include={'year', 'title', 'novelist_id'})
+                    for book in pending.values()
+                ],
+            )
+            created = {row.title: row for row in result}
+            await session.commit()
+        except IntegrityError as ex:
+            await session.rollback()
+            raise_integrity_error(ex, None)
+
+    for index, book in pending.items():
+        row = created.get(book.title)
+        if row is None:
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                f'title: {book.title} is already in use',
+            )
+        else:
+            report.created(index, BookResponse.model_validate(row))
+
+    if created:
+        prefix_index.extend(
+            [],
+            [(row.id, row.title, row.novelist_id) for row in created.values()],
+        )
+        response_cache.invalidate('books')
+
+    return report.result()
+
+
+# sem expand, só as colunas da resposta; com expand, os romancistas da
+# página chegam num único SELECT ... WHERE id IN (...) (selectinload).
+async def list_books(
+    filter: FilterBook,
+    session: AsyncSession,
+    conditional: Conditional | None = None,
+) -> BookList:
+    if filter.expand == 'novelist':
+        query = select(Book).options(selectinload(Book.novelist))
+    else:
+        query = select(
+            Book.id, Book.title, Book.year, Book.novelist_id, Book.updated_at
+        )
+
+    # filtros por romancista e faixa de anos usam ix_books_novelist_id_year
+    if filter.novelist_id is not None:
+        query = query.where(Book.novelist_id == filter.novelist_id)
+    if filter.year_from is not None:
+        query = query.where(Book.year >= filter.year_from)
+    if filter.year_to is not None:
+        query = query.where(Book.year <= filter.year_to)
+
+    result = await session.execute(keyset(query, filter, Book.id))
+    rows = result.scalars().all() if filter.expand else result.all()
+    rows, next_cursor = split_page(rows, filter, lambda row: (row.id,))
+    if conditional:
+        # expandida, a página também muda quando um romancista é alterado
+        novelists = (
+            [(row.novelist.id, row.novelist.updated_at) for row in rows]
+            if filter.expand
+            else []
+        )
+        conditional.validate(rows, next_cursor, novelists)
+
+    return BookList.model_validate(
+        {'books': rows, 'next_cursor': next_cursor}, from_attributes=True
+    )
+
+
+async def get_book(
+    id: int, session: AsyncSession, expand: str | None = None
+) -> BookResponse:
+    if expand == 'novelist':
+        query = select(Book).options(selectinload(Book.novelist))
+    else:
+        query = select(Book.id, Book.title, Book.year, Book.novelist_id)
+
+    result = await session.execute(query.where(Book.id == id))
+    book = result.scalar() if expand else result.first()
+    if book is None:
+        raise RegistryNotFound('book not found')
+
+    return BookResponse.model_validate(book)
+
+
+async def update_book(
+    id: int, book_update: BookUpdate, session: AsyncSession
+) -> BookResponse:
+    try:
+        book = await update_returning(
+            session,
+            Book,
+            id,
+            book_update.model_dump(exclude_unset=True),
+            Book.id,
+            Book.title,
+            Book.year,
+            Book.novelist_id,
+        )
+        await session.commit()
+    except IntegrityError as ex:
+        await session.rollback()
+        raise_integrity_error(ex, book_update.title)
+
+    if book is None:
+        raise RegistryNotFound('book not found')
+
+    prefix_index.add('book', book.id, book.title, novelist_id=book.novelist_id)
+    response_cache.invalidate('books')
+
+    return BookResponse.model_validate(book)
+
+
+async def delete_book(id: int, session: AsyncSession) -> None:
+    deleted = await session.scalar(
+        delete(Book).where(Book.id == id).returning(Book.id)
+    )
+    if deleted is None:
+        raise RegistryNotFound('book not found')
+
+    await session.commit()
+    prefix_index.remove('book', id)
+    response_cache.invalidate('books')
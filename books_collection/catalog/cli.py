@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from books_collection.catalog.schemas import FilterExport
+from books_collection.catalog.service import (
+    export_catalog,
+    import_catalog,
+    iter_lines,
+)
+from books_collection.database.config import session_factory
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def format_of(path: Path | None, format: str | None) -> str:
+    if format:
+        return format
+    return 'csv' if path and path.suffix.lower() == '.csv' else 'ndjson'
+
+
+async def read_chunks(path: Path):
+    with path.open('rb') as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def run_import(path: Path, format: str):
+    async with session_factory() as session:
+        return await import_catalog(
+            iter_lines(read_chunks(path)), format, session
+        )
+
+
+async def run_export(output, format: str, after: str | None):
+    async for chunk in export_catalog(
+        FilterExport(format=format, after=after)
+    ):
+        output.write(chunk)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='bulk import and export of novelists and books'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser(
+        'import', help='load an NDJSON or CSV file'
+    )
+    import_parser.add_argument('path', type=Path)
+
+    export_parser = commands.add_parser(
+        'export', help='dump the catalog as NDJSON or CSV'
+    )
+    export_parser.add_argument(
+        'path', type=Path, nargs='?', help='defaults to stdout'
+    )
+    export_parser.add_argument(
+        '--after', help='resume from the cursor of the last exported record'
+    )
+
+    for command in (import_parser, export_parser):
+        command.add_argument(
+            '--format',
+            choices=['ndjson', 'csv'],
+            help='defaults to the file extension',
+        )
+    args = parser.parse_args(argv)
+
+    format = format_of(args.path, args.format)
+
+    if args.command == 'import':
+        report = asyncio.run(run_import(args.path, format))
+        print(report.model_dump_json(indent=2))
+        return
+
+    if args.path is None:
+        asyncio.run(run_export(sys.stdout, format, args.after))
+        return
+
+    with args.path.open('a' if args.after else 'w', encoding='utf-8') as file:
+        asyncio.run(run_export(file, format, args.after))
+
+
+if __name__ == '__main__':
+    main()
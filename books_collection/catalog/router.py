@@ -0,0 +1,43 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from books_collection.auth.security import get_current_principal
+from books_collection.catalog.schemas import (
+    CatalogFormat,
+    FilterExport,
+    ImportReport,
+)
+from books_collection.catalog.service import (
+    export_catalog,
+    import_catalog,
+    iter_lines,
+)
+from books_collection.common.dependencies import Session
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+router = APIRouter(
+    prefix='/catalog',
+    tags=['catalog'],
+    dependencies=[Depends(get_current_principal)],
+)
+
+
+# o corpo é lido como stream e repassado ao COPY sem ser carregado inteiro
+@router.post('/import', status_code=HTTPStatus.OK, response_model=ImportReport)
+async def import_(
+    request: Request,
+    session: Session,
+    format: Annotated[CatalogFormat, Query()] = 'ndjson',
+):
+    return await import_catalog(iter_lines(request.stream()), format, session)
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export(filters: Annotated[FilterExport, Query()]):
+    return StreamingResponse(
+        export_catalog(filters), media_type=MEDIA_TYPES[filters.format]
+    )
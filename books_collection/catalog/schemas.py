@@ -0,0 +1,65 @@
+from typing import Literal, Optional
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
+
+from books_collection.common.pagination import decode_cursor
+
+CatalogFormat = Literal['ndjson', 'csv']
+
+
+class CatalogRow(BaseModel):
+    novelist: str = Field(min_length=1)
+    title: Optional[str] = Field(default=None, min_length=5)
+    year: Optional[int] = Field(default=None, ge=1000, le=9999)
+
+    @model_validator(mode='after')
+    def check_book_fields(self):
+        if (self.title is None) != (self.year is None):
+            raise ValueError('title and year must be informed together')
+        return self
+
+
+class RowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    rows: int
+    novelists_created: int
+    books_created: int
+    error_count: int
+    errors: list[RowError]
+
+
+class ExportedBook(BaseModel):
+    id: int
+    title: str
+    year: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExportedNovelist(BaseModel):
+    id: int
+    name: str
+    books: list[ExportedBook]
+    cursor: str
+
+
+class FilterExport(BaseModel):
+    format: CatalogFormat = 'ndjson'
+    after: Optional[str] = Field(default=None)
+
+    @field_validator('after')
+    @classmethod
+    def validate_cursor(cls, value: Optional[str]):
+        if value is not None:
+            decode_cursor(value)
+        return value
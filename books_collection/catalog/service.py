@@ -0,0 +1,327 @@
+import codecs
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from books_collection.book.models import Book
+from books_collection.catalog.schemas import (
+    CatalogFormat,
+    CatalogRow,
+    ExportedBook,
+    ExportedNovelist,
+    FilterExport,
+    ImportReport,
+    RowError,
+)
+from books_collection.common.exception.errors import InvalidUpload
+from books_collection.common.pagination import cursor_values, encode_cursor
+from books_collection.common.response_cache import response_cache
+from books_collection.database.config import replica_session_factory
+from books_collection.novelist.models import Novelist
+from books_collection.search.autocomplete import prefix_index
+from books_collection.settings import settings
+
+CSV_COLUMNS = ('novelist', 'title', 'year')
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# tabela temporária por transação: recebe o upload inteiro via COPY e é
+# descartada no commit.
+staging = Table(
+    'catalog_staging',
+    MetaData(),
+    Column('line', Integer, primary_key=True, autoincrement=False),
+    Column('novelist', String),
+    Column('title', String),
+    Column('year', Integer),
+    Column('error', String),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP',
+)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                yield line.removesuffix('\r')
+        pending += decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        raise InvalidUpload('upload must be utf-8 encoded')
+
+    if pending:
+        yield pending.removesuffix('\r')
+
+
+def describe_error(ex: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, error["loc"])) or "row"}: {error["msg"]}'
+        for error in ex.errors()
+    )
+
+
+async def parse_ndjson(lines: AsyncIterable[str]):
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+
+        try:
+            yield number, CatalogRow.model_validate_json(line)
+        except ValidationError as ex:
+            yield number, describe_error(ex)
+
+
+# um registro CSV pode ocupar várias linhas quando há quebra de linha dentro
+# de um campo entre aspas; ele só está completo com um número par de aspas.
+async def parse_csv(lines: AsyncIterable[str]):
+    header, record, start, number = None, '', 0, 0
+
+    async for line in lines:
+        number += 1
+        if not record:
+            start = number
+        record = f'{record}\n{line}' if record else line
+        if record.count('"') % 2 or not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        record = ''
+
+        if header is None:
+            header = [value.strip() for value in values]
+            if 'novelist' not in header:
+                raise InvalidUpload('csv header must have a novelist column')
+            continue
+
+        row = {
+            column: value or None
+            for column, value in zip(header, values)
+            if column in CSV_COLUMNS
+        }
+        try:
+            yield start, CatalogRow.model_validate(row)
+        except ValidationError as ex:
+            yield start, describe_error(ex)
+
+
+async def copy_to_staging(session: AsyncSession, records) -> int:
+    connection = await session.connection()
+    await connection.run_sync(staging.create)
+
+    raw_connection = await connection.get_raw_connection()
+    rows = 0
+
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            'COPY catalog_staging (line, novelist, title, year, error) '
+            'FROM STDIN'
+        ) as copy:
+            async for line, row in records:
+                rows += 1
+                if isinstance(row, str):
+                    await copy.write_row((line, None, None, None, row))
+                else:
+                    await copy.write_row((
+                        line,
+                        row.novelist,
+                        row.title,
+                        row.year,
+                        None,
+                    ))
+
+    return rows
+
+
+async def mark_conflicting_titles(session: AsyncSession) -> None:
+    ranked = (
+        select(
+            staging.c.line,
+            func.row_number()
+            .over(partition_by=staging.c.title, order_by=staging.c.line)
+            .label('position'),
+        )
+        .where(staging.c.title.is_not(None), staging.c.error.is_(None))
+        .subquery()
+    )
+    await session.execute(
+        update(staging)
+        .where(staging.c.line == ranked.c.line, ranked.c.position > 1)
+        .values(error='title is duplicated in this upload')
+    )
+    await session.execute(
+        update(staging)
+        .where(staging.c.error.is_(None), staging.c.title == Book.title)
+        .values(error='title is already in use')
+    )
+
+
+async def import_catalog(
+    lines: AsyncIterable[str], format: CatalogFormat, session: AsyncSession
+) -> ImportReport:
+    parse = parse_csv if format == 'csv' else parse_ndjson
+    rows = await copy_to_staging(session, parse(lines))
+    # tabelas temporárias não passam pelo autovacuum
+    await session.execute(text('ANALYZE catalog_staging'))
+
+    await mark_conflicting_titles(session)
+
+    novelists = await session.execute(
+        insert(Novelist)
+        .from_select(
+            ['name'],
+            select(staging.c.novelist)
+            .where(staging.c.error.is_(None))
+            .distinct(),
+        )
+        .on_conflict_do_nothing(index_elements=[Novelist.name])
+        .returning(Novelist.id, Novelist.name)
+    )
+    novelists = novelists.all()
+
+    books = await session.execute(
+        insert(Book)
+        .from_select(
+            ['year', 'title', 'novelist_id'],
+            select(staging.c.year, staging.c.title, Novelist.id)
+            .join(Novelist, Novelist.name == staging.c.novelist)
+            .where(staging.c.title.is_not(None), staging.c.error.is_(None)),
+        )
+        .on_conflict_do_nothing(index_elements=[Book.title])
+        .returning(Book.id, Book.title, Book.novelist_id)
+    )
+    books = books.all()
+
+    error_count = await session.scalar(
+        select(func.count())
+        .select_from(staging)
+        .where(staging.c.error.is_not(None))
+    )
+    errors = await session.execute(
+        select(staging.c.line, staging.c.error)
+        .where(staging.c.error.is_not(None))
+        .order_by(staging.c.line)
+        .limit(settings.CATALOG_IMPORT_MAX_ERRORS)
+    )
+    errors = [RowError(line=line, error=error) for line, error in errors]
+
+    await session.commit()
+
+    prefix_index.extend(novelists, books)
+    response_cache.invalidate('novelists', 'books')
+
+    return ImportReport(
+        rows=rows,
+        novelists_created=len(novelists),
+        books_created=len(books),
+        error_count=error_count,
+        errors=errors,
+    )
+
+
+# cursor no servidor (yield_per): o banco entrega os romancistas em lotes e
+# cada lote carrega seus livros com um único SELECT ... IN. A sessão é
+# aberta aqui porque a dependência do request já foi encerrada quando a
+# resposta começa a ser transmitida.
+async def stream_novelists(after: int | None):
+    query = (
+        select(Novelist)
+        .options(selectinload(Novelist.books).raiseload(Book.novelist))
+        .order_by(Novelist.id)
+        .execution_options(yield_per=settings.CATALOG_EXPORT_BATCH_SIZE)
+    )
+    if after is not None:
+        query = query.where(Novelist.id > after)
+
+    async with replica_session_factory() as session:
+        await session.connection(
+            execution_options={'postgresql_readonly': True}
+        )
+        novelists = await session.stream_scalars(query)
+        async for novelist in novelists:
+            yield novelist
+
+
+def export_record(novelist: Novelist) -> ExportedNovelist:
+    return ExportedNovelist(
+        id=novelist.id,
+        name=novelist.name,
+        books=[
+            ExportedBook.model_validate(book)
+            for book in sorted(novelist.books, key=lambda book: book.id)
+        ],
+        cursor=encode_cursor(novelist.id),
+    )
+
+
+async def ndjson_lines(novelists):
+    async for novelist in novelists:
+        yield export_record(novelist).model_dump_json() + '\n'
+
+
+# mesmo layout aceito pela importação, mais a coluna de retomada; uma
+# exportação retomada continua o arquivo anterior, então não repete o header
+async def csv_lines(novelists, header: bool = True):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    if header:
+        writer.writerow((*CSV_COLUMNS, 'cursor'))
+    async for novelist in novelists:
+        record = export_record(novelist)
+        for book in record.books or [None]:
+            writer.writerow((
+                record.name,
+                book.title if book else '',
+                book.year if book else '',
+                record.cursor,
+            ))
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def chunked(lines, size: int = EXPORT_CHUNK_SIZE):
+    chunk, length = [], 0
+    async for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(chunk)
+            chunk, length = [], 0
+
+    if chunk:
+        yield ''.join(chunk)
+
+
+# o cursor é validado antes de devolver o gerador, para que um cursor
+# inválido vire 400 e não uma resposta interrompida no meio.
+def export_catalog(filter: FilterExport):
+    after = cursor_values(filter.after, int)[0] if filter.after else None
+    novelists = stream_novelists(after)
+
+    if filter.format == 'csv':
+        return chunked(csv_lines(novelists, header=after is None))
+    return chunked(ndjson_lines(novelists))
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+from typing import Annotated, Generic, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from books_collection.settings import settings
+
+ItemT = TypeVar('ItemT')
+
+# corpo dos endpoints /batch: um array JSON limitado por BATCH_MAX_SIZE
+Batch = Annotated[
+    list[ItemT], Field(min_length=1, max_length=settings.BATCH_MAX_SIZE)
+]
+
+
+class BatchItem(BaseModel, Generic[ItemT]):
+    index: int
+    status: int
+    detail: Optional[str] = Field(default=None)
+    item: Optional[ItemT] = Field(default=None)
+
+
+class BatchResult(BaseModel, Generic[ItemT]):
+    created: int
+    failed: int
+    items: list[BatchItem[ItemT]]
+
+
+# acumula o resultado de cada posição do lote, na ordem de entrada
+class BatchReport(Generic[ItemT]):
+    def __init__(self, schema: type[ItemT], size: int):
+        self.schema = schema
+        self._items: list[BatchItem[ItemT] | None] = [None] * size
+
+    def created(self, index: int, item: ItemT) -> None:
+        self._items[index] = BatchItem[self.schema](
+            index=index, status=HTTPStatus.CREATED, item=item
+        )
+
+    def failed(self, index: int, status: HTTPStatus, detail: str) -> None:
+        self._items[index] = BatchItem[self.schema](
+            index=index, status=status, detail=detail
+        )
+
+    def result(self) -> BatchResult[ItemT]:
+        created = sum(
+            item.status == HTTPStatus.CREATED for item in self._items
+        )
+        return BatchResult[self.schema](
+            created=created,
+            failed=len(self._items) - created,
+            items=self._items,
+        )
+
+
+# primeira ocorrência de cada chave segue para o INSERT; as repetidas
+# falham ali mesmo, já que o RETURNING é casado com a entrada pela chave
+def first_by_key(report: BatchReport, items: list, *fields: str) -> dict:
+    pending, seen = {}, set()
+    for index, item in enumerate(items):
+        repeated = [
+            field for field in fields if (field, getattr(item, field)) in seen
+        ]
+        if repeated:
+            field = repeated[0]
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                f'{field}: {getattr(item, field)} is repeated in this batch',
+            )
+            continue
+
+        seen.update((field, getattr(item, field)) for field in fields)
+        pending[index] = item
+
+    return pending
@@ -0,0 +1,64 @@
+from hashlib import blake2b
+
+from fastapi import Request, Response
+
+from books_collection.common.exception.errors import NotModified
+
+
+# ETag fraco a partir da marca d'água da página: (id, updated_at) de cada
+# linha, mais o cursor seguinte. Qualquer insert, update ou delete que
+# afete a página muda a marca.
+def weak_etag(rows, *extra) -> str:
+    digest = blake2b(digest_size=16)
+    for row in rows:
+        digest.update(f'{row.id}:{row.updated_at.isoformat()};'.encode())
+    digest.update(repr(extra).encode())
+
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = {value.strip() for value in if_none_match.split(',')}
+    if '*' in candidates:
+        return True
+
+    # comparação fraca (RFC 9110): ignora o prefixo W/
+    opaque = etag.removeprefix('W/')
+    return any(
+        candidate.removeprefix('W/') == opaque for candidate in candidates
+    )
+
+
+class Conditional:
+    def __init__(
+        self,
+        if_none_match: str | None = None,
+        response: Response | None = None,
+    ):
+        self.if_none_match = if_none_match
+        self.response = response
+        self.etag = None
+
+    # chamado antes de montar a resposta: um 304 não paga serialização
+    def validate(self, rows, *extra) -> None:
+        self.etag = weak_etag(rows, *extra)
+        self.check(self.etag)
+
+        if self.response is not None:
+            self.response.headers['ETag'] = self.etag
+
+    # para respostas devolvidas direto pelo endpoint, que não herdam os
+    # headers do Response injetado
+    def headers(self) -> dict[str, str]:
+        return {'ETag': self.etag} if self.etag else {}
+
+    def check(self, etag: str) -> None:
+        if etag_matches(self.if_none_match, etag):
+            raise NotModified(etag)
+
+
+def get_conditional(request: Request, response: Response) -> Conditional:
+    return Conditional(request.headers.get('if-none-match'), response)
@@ -3,6 +3,14 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from books_collection.database.config import get_session
+from books_collection.common.conditional import (
+    Conditional,
+    get_conditional,
+)
+from books_collection.common.response_cache import CachedRead
+from books_collection.database.config import get_read_session, get_session
 
 Session = Annotated[AsyncSession, Depends(get_session)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+ConditionalGet = Annotated[Conditional, Depends(get_conditional)]
+CachedResponse = Annotated[CachedRead, Depends()]
@@ -16,3 +16,30 @@ class ForbidenOperation(Exception):
 class InternalError(Exception):
     def __init__(self, msg):
         self.msg = msg
+
+
+class ServiceOverloaded(Exception):
+    def __init__(self, msg, retry_after=1):
+        self.msg = msg
+        self.retry_after = retry_after
+
+
+class TooManyRequests(Exception):
+    def __init__(self, msg, retry_after=1):
+        self.msg = msg
+        self.retry_after = retry_after
+
+
+class InvalidCursor(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class InvalidUpload(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class NotModified(Exception):
+    def __init__(self, etag):
+        self.etag = etag
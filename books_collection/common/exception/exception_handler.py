@@ -2,12 +2,17 @@ from http import HTTPStatus
 
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from books_collection.common.exception.errors import (
     DuplicatedRegistry,
     ForbidenOperation,
+    InvalidCursor,
+    InvalidUpload,
+    NotModified,
     RegistryNotFound,
+    ServiceOverloaded,
+    TooManyRequests,
 )
 
 
@@ -19,6 +24,22 @@ async def validation_exception_handler(
     )
 
 
+async def invalid_cursor_exception_handler(
+    request: Request, exc: InvalidCursor
+):
+    return JSONResponse(
+        status_code=HTTPStatus.BAD_REQUEST, content={'detail': exc.msg}
+    )
+
+
+async def invalid_upload_exception_handler(
+    request: Request, exc: InvalidUpload
+):
+    return JSONResponse(
+        status_code=HTTPStatus.BAD_REQUEST, content={'detail': exc.msg}
+    )
+
+
 async def duplicated_register_exception_handler(
     request: Request, exc: DuplicatedRegistry
 ):
@@ -28,7 +49,7 @@ async def duplicated_register_exception_handler(
 
 
 async def registry_not_found_exception_handler(
-        request: Request, exc: RegistryNotFound
+    request: Request, exc: RegistryNotFound
 ):
     return JSONResponse(
         status_code=HTTPStatus.NOT_FOUND, content={'detail': exc.msg}
@@ -40,6 +61,33 @@ async def forbiden_exception_handler(request: Request, exc: ForbidenOperation):
         status_code=HTTPStatus.FORBIDDEN, content={'detail': exc.msg}
     )
 
+
+async def not_modified_exception_handler(request: Request, exc: NotModified):
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': exc.etag}
+    )
+
+
+async def service_overloaded_exception_handler(
+    request: Request, exc: ServiceOverloaded
+):
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={'detail': exc.msg},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
+async def too_many_requests_exception_handler(
+    request: Request, exc: TooManyRequests
+):
+    return JSONResponse(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        content={'detail': exc.msg},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
 # TODO: entender se o exception handler segue uma ordem de declaração.
 # ou seja, caso eu tenha uma exceção desconhecida sendo levantada, posso
 # criar um handler que capture uma Exception geral?
@@ -49,4 +97,10 @@ exception_handlers = {
     RequestValidationError: validation_exception_handler,
     DuplicatedRegistry: duplicated_register_exception_handler,
     ForbidenOperation: forbiden_exception_handler,
+    InvalidCursor: invalid_cursor_exception_handler,
+    InvalidUpload: invalid_upload_exception_handler,
+    NotModified: not_modified_exception_handler,
+    RegistryNotFound: registry_not_found_exception_handler,
+    ServiceOverloaded: service_overloaded_exception_handler,
+    TooManyRequests: too_many_requests_exception_handler,
 }
@@ -1,7 +1,26 @@
-from pydantic import BaseModel, Field
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from books_collection.common.pagination import decode_cursor
+from books_collection.settings import settings
 
 
 class FilterPage(BaseModel):
-    # TODO: validar números positivos
-    offset: int = Field(default=0)
-    limit: int = Field(default=20)
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=20, gt=0, le=settings.MAX_PAGE_SIZE)
+    after: Optional[str] = Field(default=None)
+
+    @field_validator('after')
+    @classmethod
+    def validate_cursor(cls, value: Optional[str]):
+        if value is not None:
+            decode_cursor(value)
+        return value
+
+
+def like_pattern(value: str, prefix: bool = False) -> str:
+    escaped = (
+        value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+    return f'{escaped}%' if prefix else f'%{escaped}%'
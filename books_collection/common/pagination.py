@@ -0,0 +1,59 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+
+from books_collection.common.exception.errors import InvalidCursor
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(cursor + padding))
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        raise ValueError('invalid cursor')
+
+    if not isinstance(values, list) or not values:
+        raise ValueError('invalid cursor')
+
+    return values
+
+
+def matches_type(value, type_: type) -> bool:
+    if isinstance(value, bool):
+        return False
+    if type_ is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, type_)
+
+
+# o cursor vem do cliente: além do tamanho, cada valor precisa ter o tipo da
+# coluna correspondente, senão o erro só apareceria no banco (500).
+def cursor_values(cursor: str, *types: type) -> list:
+    values = decode_cursor(cursor)
+    if len(values) != len(types) or not all(map(matches_type, values, types)):
+        raise InvalidCursor('cursor does not match the requested ordering')
+    return values
+
+
+# paginação por chave (keyset): `WHERE key > :after ORDER BY key`, custo
+# constante independente da profundidade da página.
+def keyset(query, page, key, key_type: type = int):
+    if page.after:
+        (after,) = cursor_values(page.after, key_type)
+        query = query.where(key > after)
+
+    return query.order_by(key).offset(page.offset).limit(page.limit + 1)
+
+
+def split_page(rows, page, cursor_of) -> tuple[list, str | None]:
+    rows = list(rows)
+    if len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[: page.limit]
+    return rows, encode_cursor(*cursor_of(rows[-1]))
@@ -0,0 +1,163 @@
+import fcntl
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from hashlib import blake2b
+from math import ceil
+from time import time
+
+from books_collection.settings import settings
+
+
+class MemoryBucketBackend:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def update(self, key: str, apply):
+        state = self._buckets.get(key)
+        new_state, result = apply(state)
+
+        self._buckets[key] = new_state
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return result
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+# cada slot guarda (hash da chave, tokens, último refill) em um arquivo
+# mapeado em memória, compartilhado entre os workers e protegido por flock.
+class SharedMemoryBucketBackend:
+    slot = struct.Struct('=Qdd')
+    max_probes = 8
+
+    def __init__(self, path: str, max_keys: int):
+        self.path = path
+        self.max_keys = max_keys
+        self._size = self.slot.size * max_keys
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < self._size:
+            os.ftruncate(self._fd, self._size)
+        self._map = mmap.mmap(self._fd, self._size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _find_slot(self, key_hash: int):
+        start = key_hash % self.max_keys
+        oldest_offset, oldest_last = None, None
+
+        for probe in range(min(self.max_probes, self.max_keys)):
+            offset = ((start + probe) % self.max_keys) * self.slot.size
+            slot_hash, tokens, last = self.slot.unpack_from(self._map, offset)
+
+            if slot_hash == key_hash:
+                return offset, (tokens, last)
+            if slot_hash == 0:
+                return offset, None
+            if oldest_last is None or last < oldest_last:
+                oldest_offset, oldest_last = offset, last
+
+        return oldest_offset, None
+
+    def update(self, key: str, apply):
+        key_hash = self._hash(key)
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            offset, state = self._find_slot(key_hash)
+            new_state, result = apply(state)
+            self.slot.pack_into(self._map, offset, key_hash, *new_state)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        return result
+
+    def clear(self) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            self._map[:] = bytes(self._size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class TokenBucketLimiter:
+    def __init__(
+        self, backend, capacity: int, refill_per_sec: float, clock=time
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._clock = clock
+        self.allowed = 0
+        self.rejected = 0
+
+    # retorna 0 quando permitido ou os segundos até o próximo token
+    def acquire(self, key: str) -> float:
+        now = self._clock()
+
+        def apply(state):
+            tokens, last = state or (self.capacity, now)
+            tokens = min(
+                self.capacity,
+                tokens + max(now - last, 0) * self.refill_per_sec,
+            )
+
+            if tokens >= 1:
+                return (tokens - 1, now), 0.0
+            return (tokens, now), (1 - tokens) / self.refill_per_sec
+
+        retry_after = self.backend.update(key, apply)
+
+        if retry_after:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+
+        return retry_after
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.allowed = 0
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {
+            'backend': type(self.backend).__name__,
+            'capacity': self.capacity,
+            'refill_per_sec': self.refill_per_sec,
+            'allowed': self.allowed,
+            'rejected': self.rejected,
+        }
+
+
+def retry_after_header(seconds: float) -> int:
+    return max(ceil(seconds), 1)
+
+
+def build_backend():
+    if settings.RATE_LIMIT_BACKEND == 'shared_memory':
+        return SharedMemoryBucketBackend(
+            settings.RATE_LIMIT_SHARED_MEMORY_PATH,
+            settings.RATE_LIMIT_MAX_KEYS,
+        )
+    return MemoryBucketBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = TokenBucketLimiter(
+    backend=build_backend(),
+    capacity=settings.RATE_LIMIT_CAPACITY,
+    refill_per_sec=settings.RATE_LIMIT_REFILL_PER_SEC,
+)
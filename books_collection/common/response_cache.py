@@ -0,0 +1,365 @@
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from time import perf_counter, time
+from typing import Annotated, Awaitable, Callable
+
+from fastapi import Depends, Request, Response
+from pydantic import BaseModel
+
+from books_collection.common.conditional import Conditional, get_conditional
+from books_collection.common.responses import encode
+from books_collection.database.config import read_session, wrote_recently
+from books_collection.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    generation: int
+    stored_at: float
+    cost: float
+    etag: str
+    body: bytes
+
+    header = struct.Struct('=qddH')
+
+    def pack(self) -> bytes:
+        etag = self.etag.encode()
+        return (
+            self.header.pack(
+                self.generation, self.stored_at, self.cost, len(etag)
+            )
+            + etag
+            + self.body
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'CacheEntry':
+        generation, stored_at, cost, etag_size = cls.header.unpack_from(data)
+        start = cls.header.size
+        return cls(
+            generation,
+            stored_at,
+            cost,
+            data[start : start + etag_size].decode(),
+            data[start + etag_size :],
+        )
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._bumped_at: dict[str, float] = {}
+
+    def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bumped_at(self, namespace: str) -> float:
+        return self._bumped_at.get(namespace, 0.0)
+
+    def bump(self, namespace: str, at: float | None = None) -> None:
+        self._generations[namespace] = self.generation(namespace) + 1
+        self._bumped_at[namespace] = time() if at is None else at
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+        self._bumped_at.clear()
+
+
+# um arquivo por entrada e um contador de geração por namespace num
+# diretório compartilhado (tmpfs), visível para todos os workers.
+class FileCacheBackend:
+    prune_every = 64
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        name = blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.path, f'{name}.entry')
+
+    def _generation_path(self, namespace: str) -> str:
+        return os.path.join(self.path, f'{namespace}.generation')
+
+    def get(self, key: str) -> CacheEntry | None:
+        try:
+            with open(self._entry_path(key), 'rb') as file:
+                return CacheEntry.unpack(file.read())
+        except (FileNotFoundError, struct.error):
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        path = self._entry_path(key)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(entry.pack())
+        os.replace(temporary, path)
+
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        entries = [
+            entry
+            for entry in os.scandir(self.path)
+            if entry.name.endswith('.entry')
+        ]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+
+    # conteúdo: "<geração> <instante do bump>"
+    def _read_generation(self, namespace: str) -> tuple[int, float]:
+        try:
+            with open(self._generation_path(namespace), 'rb') as file:
+                generation, bumped_at = file.read().split()
+        except FileNotFoundError:
+            return 0, 0.0
+        return int(generation), float(bumped_at)
+
+    def generation(self, namespace: str) -> int:
+        return self._read_generation(namespace)[0]
+
+    def bumped_at(self, namespace: str) -> float:
+        return self._read_generation(namespace)[1]
+
+    # o contador é regravado por inteiro e trocado com os.replace, como as
+    # entradas: quem lê sem lock vê o valor antigo ou o novo, nunca um
+    # arquivo vazio. O flock num arquivo à parte serializa os bumps.
+    def bump(self, namespace: str, at: float | None = None) -> None:
+        path = self._generation_path(namespace)
+        fd = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            generation = self.generation(namespace) + 1
+            at = time() if at is None else at
+            temporary = f'{path}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as file:
+                file.write(f'{generation} {at}'.encode())
+            os.replace(temporary, path)
+        finally:
+            os.close(fd)
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.path):
+            os.remove(entry.path)
+
+
+# entradas ficam frescas por ttl_secs e até serem invalidadas (troca de
+# geração do namespace). Com stale_secs > 0, uma entrada vencida ou
+# invalidada ainda é servida por mais stale_secs enquanto uma única tarefa
+# em background a recalcula.
+class ResponseCache:
+    def __init__(
+        self, backend, ttl_secs: float, stale_secs: float = 0, clock=time
+    ):
+        self.backend = backend
+        self.ttl_secs = ttl_secs
+        self.stale_secs = stale_secs
+        self._clock = clock
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.saved_secs = 0.0
+
+    def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self.backend.bump(namespace, self._clock())
+
+    # logo após um bump a réplica pode ainda não ter a escrita: preenchida
+    # por ela, uma página velha ficaria marcada com a geração nova e seria
+    # servida como HIT a todos até o TTL. Nessa janela a leitura vai ao
+    # primário.
+    def bumped_recently(self, namespace: str) -> bool:
+        elapsed = self._clock() - self.backend.bumped_at(namespace)
+        return elapsed < settings.READ_YOUR_WRITES_SECS
+
+    # carrega sempre com um Conditional novo: com o If-None-Match do cliente,
+    # o NotModified sairia de dentro do load e a entrada nunca seria gravada
+    async def fill(
+        self,
+        key: str,
+        generation: int,
+        load: Callable[..., Awaitable[BaseModel]],
+        primary: bool = False,
+    ) -> CacheEntry:
+        start = perf_counter()
+        conditional = Conditional()
+        async with read_session(primary) as session:
+            content = await load(session, conditional)
+        body = encode(content)
+
+        entry = CacheEntry(
+            generation=generation,
+            stored_at=self._clock(),
+            cost=perf_counter() - start,
+            etag=conditional.etag or '',
+            body=body,
+        )
+        self.backend.set(key, entry)
+        return entry
+
+    async def refresh(
+        self, key: str, generation: int, load, primary: bool
+    ) -> None:
+        try:
+            await self.fill(key, generation, load, primary)
+            self.refreshes += 1
+        except Exception:
+            # falha no refresh: a entrada antiga continua até expirar
+            logger.exception('response cache refresh failed for %s', key)
+        finally:
+            self._refreshing.discard(key)
+
+    def schedule_refresh(
+        self, key: str, generation: int, load, primary: bool
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        self._refreshing.add(key)
+        task = asyncio.create_task(
+            self.refresh(key, generation, load, primary)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def serve(
+        self,
+        namespace: str,
+        key: str,
+        load: Callable[..., Awaitable[BaseModel]],
+        conditional: Conditional,
+        primary: bool = False,
+    ) -> Response:
+        key = f'{namespace}:{key}'
+        generation = self.backend.generation(namespace)
+        entry = self.backend.get(key)
+        age = self._clock() - entry.stored_at if entry else None
+
+        if entry and entry.generation == generation and age <= self.ttl_secs:
+            self.hits += 1
+            self.saved_secs += entry.cost
+            status = 'HIT'
+        # quem acabou de escrever não recebe uma geração anterior à escrita:
+        # vai pelo MISS para enxergar a própria alteração
+        elif (
+            entry
+            and self.stale_secs
+            and age <= self.ttl_secs + self.stale_secs
+            and not (primary and entry.generation != generation)
+        ):
+            self.stale_hits += 1
+            self.saved_secs += entry.cost
+            status = 'STALE'
+            self.schedule_refresh(
+                key, generation, load, self.bumped_recently(namespace)
+            )
+        else:
+            self.misses += 1
+            primary = primary or self.bumped_recently(namespace)
+            entry = await self.fill(key, generation, load, primary)
+            status = 'MISS'
+
+        if entry.etag:
+            conditional.check(entry.etag)
+        return self.response(entry, status)
+
+    @staticmethod
+    def response(entry: CacheEntry, status: str) -> Response:
+        headers = {'X-Cache': status}
+        if entry.etag:
+            headers['ETag'] = entry.etag
+
+        return Response(
+            content=entry.body, media_type='application/json', headers=headers
+        )
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.saved_secs = 0.0
+
+    def stats(self) -> dict:
+        served = self.hits + self.stale_hits
+        total = served + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'hit_ratio': served / total if total else 0.0,
+            'saved_ms': self.saved_secs * 1000,
+        }
+
+
+def build_backend():
+    if settings.RESPONSE_CACHE_BACKEND == 'file':
+        return FileCacheBackend(
+            settings.RESPONSE_CACHE_PATH, settings.RESPONSE_CACHE_MAX_ENTRIES
+        )
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(
+    backend=build_backend(),
+    ttl_secs=settings.RESPONSE_CACHE_TTL_SECS,
+    stale_secs=settings.RESPONSE_CACHE_STALE_SECS,
+)
+
+
+class CachedRead:
+    def __init__(
+        self,
+        request: Request,
+        conditional: Annotated[Conditional, Depends(get_conditional)],
+    ):
+        query = sorted(request.query_params.multi_items())
+        self.key = f'{request.url.path}?{query}'
+        self.conditional = conditional
+        self.primary = wrote_recently(request)
+
+    # a sessão só é aberta num MISS: um HIT não toca o pool de conexões
+    async def serve(self, namespace: str, load) -> Response:
+        return await response_cache.serve(
+            namespace, self.key, load, self.conditional, self.primary
+        )
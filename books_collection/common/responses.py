@@ -0,0 +1,41 @@
+from typing import Any, TypeVar
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+# modelos já validados no service vão direto para bytes pelo serializador
+# do pydantic-core (mais rápido que orjson sobre um model_dump); o resto
+# (dicts e listas simples) passa pelo orjson.
+def encode(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    return orjson.dumps(content)
+
+
+# devolvida pelo endpoint, o FastAPI não revalida contra o response_model
+# nem passa pelo jsonable_encoder: o response_model fica só para o OpenAPI.
+class ModelResponse(Response):
+    media_type = 'application/json'
+
+    @staticmethod
+    def render(content: Any) -> bytes:
+        return encode(content)
+
+
+# entidade mapeada -> schema lendo só os campos que o schema declara.
+# Ao contrário do asdict, não copia cada campo nem percorre as relações;
+# relações não carregadas (lazy='raise') ficam com o default do schema.
+def to_response(schema: type[ModelT], entity: Any) -> ModelT:
+    state = inspect(entity)
+    skipped = state.unloaded.intersection(state.mapper.relationships.keys())
+
+    return schema.model_validate({
+        name: getattr(entity, name)
+        for name in schema.model_fields
+        if name not in skipped
+    })
@@ -0,0 +1,31 @@
+from typing import Any
+
+from sqlalchemy import Row, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# PATCH num único statement: UPDATE ... WHERE id = :id RETURNING só com os
+# campos enviados (updated_at entra pelo onupdate). Nenhuma linha de volta
+# significa registro inexistente.
+async def update_returning(
+    session: AsyncSession,
+    model: type,
+    id: int,
+    values: dict[str, Any],
+    *columns,
+) -> Row | None:
+    result = await session.execute(
+        update(model)
+        .where(model.id == id)
+        .values(values)
+        .returning(*columns)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first()
+
+
+# nome da constraint violada, vindo do diagnóstico do postgres
+def constraint_name(ex: IntegrityError) -> str | None:
+    diag = getattr(ex.orig, 'diag', None)
+    return getattr(diag, 'constraint_name', None)
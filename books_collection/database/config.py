@@ -1,10 +1,86 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextlib import asynccontextmanager
+from time import time
 
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from books_collection.database.pool import InstrumentedQueuePool
 from books_collection.settings import settings
 
-engine = create_async_engine(settings.DATABASE_URL)
+READ_YOUR_WRITES_COOKIE = 'rw_until'
+
+
+def build_engine(url: str):
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+
+
+engine = build_engine(settings.DATABASE_URL)
+replica_engine = (
+    build_engine(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+# sessões fora do ciclo de request (tarefas em background, startup)
+session_factory = async_sessionmaker(engine, expire_on_commit=False)
+replica_session_factory = async_sessionmaker(
+    replica_engine or engine, expire_on_commit=False
+)
 
 
 async def get_session():
-    async with AsyncSession(engine, expire_on_commit=False) as session:
+    async with session_factory() as session:
         yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+def mark_write(response: Response) -> None:
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(int(time()) + settings.READ_YOUR_WRITES_SECS),
+        max_age=settings.READ_YOUR_WRITES_SECS,
+        httponly=True,
+    )
+
+
+# GETs rodam em transações READ ONLY na réplica, exceto logo após uma escrita
+# do mesmo cliente, quando vão para o primário para enxergar a própria escrita.
+@asynccontextmanager
+async def read_session(primary: bool = False):
+    factory = (
+        session_factory
+        if primary or replica_engine is None
+        else replica_session_factory
+    )
+
+    async with factory() as session:
+        await session.connection(
+            execution_options={'postgresql_readonly': True}
+        )
+        yield session
+
+
+async def get_read_session(request: Request):
+    async with read_session(primary=wrote_recently(request)) as session:
+        yield session
+
+
+def pool_stats() -> dict:
+    stats = {'primary': engine.pool.stats()}
+    if replica_engine is not None:
+        stats['replica'] = replica_engine.pool.stats()
+    return stats
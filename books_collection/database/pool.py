@@ -0,0 +1,53 @@
+from time import perf_counter
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+# mede quanto tempo cada request espera por uma conexão livre do pool
+class PoolMetricsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_secs = 0.0
+        self.max_wait_secs = 0.0
+
+    def connect(self):
+        self.waiters += 1
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiters -= 1
+
+        wait = perf_counter() - start
+        self.checkouts += 1
+        self.total_wait_secs += wait
+        self.max_wait_secs = max(self.max_wait_secs, wait)
+
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            'size': self.size(),
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': max(self.overflow(), 0),
+            'waiters': self.waiters,
+            'checkouts': self.checkouts,
+            'failed_checkouts': self.timeouts,
+            'avg_wait_ms': (
+                round(self.total_wait_secs / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0
+            ),
+            'max_wait_ms': round(self.max_wait_secs * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
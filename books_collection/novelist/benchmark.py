@@ -0,0 +1,81 @@
+import argparse
+import tracemalloc
+from dataclasses import asdict
+from time import perf_counter
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from books_collection.book.models import Book
+from books_collection.common.responses import to_response
+from books_collection.novelist.models import Novelist
+from books_collection.novelist.schemas import NovelistResponse
+
+
+def build_novelist(books: int) -> Novelist:
+    novelist = Novelist(name='Machado de Assis')
+    novelist.id = 1
+
+    loaded = []
+    for number in range(books):
+        book = Book(year=1900, title=f'Livro {number:06}', novelist_id=1)
+        book.id = number + 1
+        loaded.append(book)
+
+    # como se a coleção tivesse vindo de um selectinload
+    set_committed_value(novelist, 'books', loaded)
+    return novelist
+
+
+# caminho anterior: cópia profunda da entidade, coleção de livros inclusa
+def asdict_response(novelist: Novelist) -> NovelistResponse:
+    values = asdict(novelist)
+    return NovelistResponse(id=values['id'], name=values['name'])
+
+
+def schema_response(novelist: Novelist) -> NovelistResponse:
+    return to_response(NovelistResponse, novelist)
+
+
+def run_candidate(novelist: Novelist, convert, iterations: int) -> dict:
+    convert(novelist)
+
+    start = perf_counter()
+    for _ in range(iterations):
+        convert(novelist)
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    convert(novelist)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ms_per_call': elapsed / iterations * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='novelist response: dataclasses.asdict vs to_response'
+    )
+    parser.add_argument('--books', type=int, default=10_000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    novelist = build_novelist(args.books)
+
+    print(f'{"books":>6} {"path":>9} {"ms/call":>9} {"peak KiB":>9}')
+    for name, convert in (
+        ('asdict', asdict_response),
+        ('schema', schema_response),
+    ):
+        result = run_candidate(novelist, convert, args.iterations)
+        print(
+            f'{args.books:>6} {name:>9} {result["ms_per_call"]:>9.3f} '
+            f'{result["peak_kib"]:>9.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
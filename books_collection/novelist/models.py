@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy import Computed, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from books_collection.book.models import Book
@@ -12,17 +13,42 @@ from books_collection.database.tables import table_registry
 @table_registry.mapped_as_dataclass
 class Novelist:
     __tablename__ = 'novelists'
+    __table_args__ = (
+        Index(
+            'ix_novelists_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_novelists_search_vector',
+            'search_vector',
+            postgresql_using='gin',
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False, unique=True)
 
+    # os livros são apagados pelo ON DELETE CASCADE do banco
     books: Mapped[list[Book]] = relationship(
         init=False,
         cascade='all, delete-orphan',
-        lazy='selectin',
+        passive_deletes=True,
+        lazy='raise',
         back_populates='novelist',
     )
 
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', name)", persisted=True),
+        init=False,
+        repr=False,
+        compare=False,
+        deferred=True,
+        deferred_raiseload=True,
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
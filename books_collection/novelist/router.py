@@ -3,8 +3,15 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from books_collection.auth.security import get_current_account
-from books_collection.common.dependencies import Session
+from books_collection.auth.security import get_current_principal
+from books_collection.common.batch import Batch, BatchResult
+from books_collection.common.dependencies import (
+    CachedResponse,
+    ConditionalGet,
+    ReadSession,
+    Session,
+)
+from books_collection.common.responses import ModelResponse
 from books_collection.novelist.schemas import (
     FilterNovelist,
     NovelistList,
@@ -14,7 +21,9 @@ from books_collection.novelist.schemas import (
 )
 from books_collection.novelist.service import (
     create_novelist,
+    create_novelists,
     delete_novelist,
+    get_novelist,
     list_novelists,
     update_novelist,
 )
@@ -22,7 +31,7 @@ from books_collection.novelist.service import (
 router = APIRouter(
     prefix='/novelists',
     tags=['novelists'],
-    dependencies=[Depends(get_current_account)],
+    dependencies=[Depends(get_current_principal)],
 )
 
 QueryParam = Annotated[FilterNovelist, Query()]
@@ -32,19 +41,45 @@ QueryParam = Annotated[FilterNovelist, Query()]
     '/', status_code=HTTPStatus.CREATED, response_model=NovelistResponse
 )
 async def create(novelist: NovelistRequest, session: Session):
-    return await create_novelist(novelist, session)
+    return ModelResponse(
+        await create_novelist(novelist, session), HTTPStatus.CREATED
+    )
+
+
+@router.post(
+    '/batch',
+    status_code=HTTPStatus.OK,
+    response_model=BatchResult[NovelistResponse],
+)
+async def create_batch(novelists: Batch[NovelistRequest], session: Session):
+    return ModelResponse(await create_novelists(novelists, session))
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=NovelistList)
-async def list(filters: QueryParam, session: Session):
-    return await list_novelists(filters, session)
+async def list(filters: QueryParam, cache: CachedResponse):
+    return await cache.serve(
+        'novelists',
+        lambda session, conditional: list_novelists(
+            filters, session, conditional
+        ),
+    )
+
+
+@router.get(
+    '/{id}', status_code=HTTPStatus.OK, response_model=NovelistResponse
+)
+async def get(id: int, session: ReadSession, conditional: ConditionalGet):
+    return ModelResponse(
+        await get_novelist(id, session, conditional),
+        headers=conditional.headers(),
+    )
 
 
 @router.patch(
     '/{id}', status_code=HTTPStatus.OK, response_model=NovelistResponse
 )
 async def update(id: int, novelist: NovelistUpdate, session: Session):
-    return await update_novelist(id, novelist)
+    return ModelResponse(await update_novelist(id, novelist, session))
 
 
 @router.delete('/{id}', status_code=HTTPStatus.NO_CONTENT)
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from books_collection.common.filters import FilterPage
 
@@ -12,6 +12,8 @@ class NovelistRequest(BaseModel):
 class NovelistResponse(NovelistRequest):
     id: int
 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class NovelistUpdate(BaseModel):
     name: Optional[str] = Field(default=None)
@@ -19,6 +21,7 @@ class NovelistUpdate(BaseModel):
 
 class NovelistList(BaseModel):
     novelists: list[NovelistResponse]
+    next_cursor: Optional[str] = Field(default=None)
 
 
 class FilterNovelist(FilterPage):
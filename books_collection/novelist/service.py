@@ -1,13 +1,31 @@
-from dataclasses import asdict
+from http import HTTPStatus
 
-from sqlalchemy import select
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from books_collection.common.batch import (
+    BatchReport,
+    BatchResult,
+    first_by_key,
+)
+from books_collection.common.conditional import Conditional
 from books_collection.common.exception.errors import (
     DuplicatedRegistry,
     RegistryNotFound,
 )
+from books_collection.common.filters import like_pattern
+from books_collection.common.pagination import (
+    cursor_values,
+    keyset,
+    split_page,
+)
+from books_collection.common.response_cache import response_cache
+from books_collection.common.statements import (
+    constraint_name,
+    update_returning,
+)
 from books_collection.novelist.models import Novelist
 from books_collection.novelist.schemas import (
     FilterNovelist,
@@ -16,66 +34,188 @@ from books_collection.novelist.schemas import (
     NovelistResponse,
     NovelistUpdate,
 )
+from books_collection.search.autocomplete import prefix_index
 
 
 async def create_novelist(
     novelist: NovelistRequest, session: AsyncSession
 ) -> NovelistResponse:
-    new_novelist = Novelist(name=novelist.name)
+    result = await session.execute(
+        insert(Novelist)
+        .values(name=novelist.name)
+        .on_conflict_do_nothing(index_elements=[Novelist.name])
+        .returning(Novelist.id, Novelist.name)
+    )
+    new_novelist = result.first()
+    if new_novelist is None:
+        raise DuplicatedRegistry(f'name: {novelist.name} is already in use')
 
-    try:
-        session.add(new_novelist)
-        await session.commit()
-        await session.refresh(new_novelist)
-
-        return NovelistResponse(**asdict(new_novelist))
-    except IntegrityError as ex:
-        await session.rollback()
+    await session.commit()
+    prefix_index.add('novelist', new_novelist.id, new_novelist.name)
+    response_cache.invalidate('novelists')
+
+    return NovelistResponse.model_validate(new_novelist)
+
+
+# um INSERT ... VALUES (...), (...) RETURNING por lote (insertmanyvalues);
+# o ON CONFLICT deixa de fora os nomes já cadastrados sem abortar o resto
+async def create_novelists(
+    novelists: list[NovelistRequest], session: AsyncSession
+) -> BatchResult[NovelistResponse]:
+    report = BatchReport(NovelistResponse, len(novelists))
+    pending = first_by_key(report, novelists, 'name')
+
+    result = await session.execute(
+        insert(Novelist)
+        .on_conflict_do_nothing(index_elements=[Novelist.name])
+        .returning(Novelist.id, Novelist.name),
+        [{'name': novelist.name} for novelist in pending.values()],
+    )
+    created = {row.name: row for row in result}
+    await session.commit()
 
-        error_detail = ex.orig
-        if 'novelists_name_key' in error_detail:
-            raise DuplicatedRegistry(
-                f'name: {novelist.name} is already in use'
+    for index, novelist in pending.items():
+        row = created.get(novelist.name)
+        if row is None:
+            report.failed(
+                index,
+                HTTPStatus.CONFLICT,
+                f'name: {novelist.name} is already in use',
             )
-        raise DuplicatedRegistry('duplicated registry error')
+        else:
+            report.created(index, NovelistResponse.model_validate(row))
+
+    if created:
+        prefix_index.extend(
+            [(row.id, row.name) for row in created.values()], []
+        )
+        response_cache.invalidate('novelists')
+
+    return report.result()
 
 
 async def list_novelists(
-    filter: FilterNovelist, session: AsyncSession
+    filter: FilterNovelist,
+    session: AsyncSession,
+    conditional: Conditional | None = None,
 ) -> NovelistList:
-    query = select(Novelist).offset(filter.offset).limit(filter.limit)
-
     if filter.name:
-        query = query.filter(filter.name in Novelist.name)
+        return await search_novelists(filter, session, conditional)
+
+    query = keyset(
+        select(Novelist.id, Novelist.name, Novelist.updated_at),
+        filter,
+        Novelist.id,
+    )
+
+    result = await session.execute(query)
+    rows, next_cursor = split_page(result.all(), filter, lambda row: (row.id,))
+    if conditional:
+        conditional.validate(rows, next_cursor)
+
+    return NovelistList.model_validate(
+        {'novelists': rows, 'next_cursor': next_cursor}, from_attributes=True
+    )
+
+
+# ILIKE '%nome%' servido pelo índice GIN pg_trgm (ix_novelists_name_trgm),
+# ordenado pela similaridade com o termo buscado.
+async def search_novelists(
+    filter: FilterNovelist,
+    session: AsyncSession,
+    conditional: Conditional | None = None,
+) -> NovelistList:
+    score = func.similarity(Novelist.name, filter.name)
+    query = select(
+        Novelist.id, Novelist.name, Novelist.updated_at, score.label('score')
+    ).where(Novelist.name.ilike(like_pattern(filter.name), escape='\\'))
+
+    if filter.after:
+        after_score, after_id = cursor_values(filter.after, float, int)
+        query = query.where(
+            or_(
+                score < after_score,
+                and_(score == after_score, Novelist.id > after_id),
+            )
+        )
+
+    query = (
+        query.order_by(score.desc(), Novelist.id)
+        .offset(filter.offset)
+        .limit(filter.limit + 1)
+    )
 
-    result = await session.scalars(query)
-    novelists = result.all()
+    result = await session.execute(query)
+    rows, next_cursor = split_page(
+        result.all(), filter, lambda row: (row.score, row.id)
+    )
+    if conditional:
+        conditional.validate(rows, next_cursor)
 
-    return NovelistList(novelists=novelists)
+    return NovelistList.model_validate(
+        {'novelists': rows, 'next_cursor': next_cursor}, from_attributes=True
+    )
+
+
+async def get_novelist(
+    id: int, session: AsyncSession, conditional: Conditional | None = None
+) -> NovelistResponse:
+    result = await session.execute(
+        select(Novelist.id, Novelist.name, Novelist.updated_at).where(
+            Novelist.id == id
+        )
+    )
+    novelist = result.first()
+    if novelist is None:
+        raise RegistryNotFound('novelist not found')
+
+    if conditional:
+        conditional.validate([novelist])
+
+    return NovelistResponse.model_validate(novelist)
 
 
 async def update_novelist(
     id: int, novelist_update: NovelistUpdate, session: AsyncSession
 ) -> NovelistResponse:
-    novelist = get_novelist_or_raise(id, session)
-    for key, value in novelist_update.model_dump(exclude_unset=True).items():
-        setattr(novelist, key, value)
+    try:
+        novelist = await update_returning(
+            session,
+            Novelist,
+            id,
+            novelist_update.model_dump(exclude_unset=True),
+            Novelist.id,
+            Novelist.name,
+        )
+        await session.commit()
+    except IntegrityError as ex:
+        await session.rollback()
 
-    await session.commit()
-    await session.refresh(novelist)
+        if constraint_name(ex) == 'novelists_name_key':
+            raise DuplicatedRegistry(
+                f'name: {novelist_update.name} is already in use'
+            )
+        raise DuplicatedRegistry('duplicated registry error')
 
-    return NovelistResponse(**asdict(novelist))
+    if novelist is None:
+        raise RegistryNotFound('novelist not found')
 
+    prefix_index.add('novelist', novelist.id, novelist.name)
+    # listagens de livros com expand=novelist trazem o nome
+    response_cache.invalidate('novelists', 'books')
 
-async def delete_novelist(id: int, session: AsyncSession) -> None:
-    novelist = get_novelist_or_raise(id, session)
-    await session.delete(novelist)
-    await session.commit()
+    return NovelistResponse.model_validate(novelist)
 
 
-async def get_novelist_or_raise(id: int, session: AsyncSession) -> Novelist:
-    novelist = await session.scalar(select(Novelist).where(Novelist.id == id))
-    if novelist:
-        return novelist
+async def delete_novelist(id: int, session: AsyncSession) -> None:
+    # um único DELETE: os livros saem pelo ON DELETE CASCADE, sem
+    # carregá-los nem apagá-los um a um
+    deleted = await session.scalar(
+        delete(Novelist).where(Novelist.id == id).returning(Novelist.id)
+    )
+    if deleted is None:
+        raise RegistryNotFound('novelist not found')
 
-    raise RegistryNotFound('novelist not found')
+    await session.commit()
+    prefix_index.remove_novelist(id)
+    response_cache.invalidate('novelists', 'books')
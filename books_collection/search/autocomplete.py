@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from books_collection.book.models import Book
+from books_collection.database.config import replica_session_factory
+from books_collection.novelist.models import Novelist
+from books_collection.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# índice de prefixos por worker: array ordenado de (texto normalizado, tipo,
+# id), consultado com bisect sem nenhum acesso ao banco.
+class PrefixIndex:
+    def __init__(self):
+        self._keys: list[tuple[str, str, int]] = []
+        self._texts: dict[tuple[str, int], str] = {}
+        self._books_by_novelist: dict[int, set[int]] = {}
+        self._novelist_of_book: dict[int, int] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.casefold()
+
+    def build(self, novelists, books) -> None:
+        self._keys, self._texts = [], {}
+        self._books_by_novelist, self._novelist_of_book = {}, {}
+        self.extend(novelists, books)
+
+    # inserção em lote: anexa e reordena uma vez só, em vez de um insort
+    # (O(n)) por linha.
+    def extend(self, novelists, books) -> None:
+        for id, name in novelists:
+            self._keys.append((self.normalize(name), 'novelist', id))
+            self._texts['novelist', id] = name
+
+        for id, title, novelist_id in books:
+            self._keys.append((self.normalize(title), 'book', id))
+            self._texts['book', id] = title
+            self._books_by_novelist.setdefault(novelist_id, set()).add(id)
+            self._novelist_of_book[id] = novelist_id
+
+        self._keys.sort()
+        self.ready = True
+
+    def add(
+        self, kind: str, id: int, text: str, novelist_id: int | None = None
+    ) -> None:
+        self.remove(kind, id)
+
+        insort(self._keys, (self.normalize(text), kind, id))
+        self._texts[kind, id] = text
+
+        if novelist_id is not None:
+            self._books_by_novelist.setdefault(novelist_id, set()).add(id)
+            self._novelist_of_book[id] = novelist_id
+
+    def remove(self, kind: str, id: int) -> None:
+        text = self._texts.pop((kind, id), None)
+        if text is None:
+            return
+
+        key = (self.normalize(text), kind, id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+        if kind == 'book':
+            novelist_id = self._novelist_of_book.pop(id, None)
+            self._books_by_novelist.get(novelist_id, set()).discard(id)
+
+    def remove_novelist(self, id: int) -> None:
+        self.remove('novelist', id)
+        for book_id in self._books_by_novelist.pop(id, set()).copy():
+            self.remove('book', book_id)
+
+    def search(self, prefix: str, limit: int) -> list[tuple[str, int, str]]:
+        prefix = self.normalize(prefix)
+        position = bisect_left(self._keys, (prefix,))
+        suggestions = []
+
+        while position < len(self._keys) and len(suggestions) < limit:
+            key, kind, id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            suggestions.append((kind, id, self._texts[kind, id]))
+            position += 1
+
+        return suggestions
+
+    def clear(self) -> None:
+        self.build([], [])
+        self.ready = False
+
+    def stats(self) -> dict:
+        return {'ready': self.ready, 'size': len(self._keys)}
+
+
+prefix_index = PrefixIndex()
+
+
+async def load_prefix_index(session: AsyncSession) -> None:
+    novelists = await session.execute(select(Novelist.id, Novelist.name))
+    books = await session.execute(
+        select(Book.id, Book.title, Book.novelist_id)
+    )
+
+    prefix_index.build(novelists.all(), books.all())
+
+
+# cada worker só enxerga as próprias escritas: a reconstrução periódica
+# incorpora as alterações feitas pelos demais.
+async def sync_prefix_index() -> None:
+    while True:
+        await asyncio.sleep(settings.AUTOCOMPLETE_REBUILD_SECS)
+        try:
+            async with replica_session_factory() as session:
+                await load_prefix_index(session)
+        except Exception:
+            # banco indisponível: mantém o índice atual e tenta de novo
+            logger.exception('prefix index rebuild failed')
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from books_collection.auth.security import get_current_principal
+from books_collection.common.dependencies import ReadSession
+from books_collection.common.responses import ModelResponse
+from books_collection.search.schemas import (
+    FilterAutocomplete,
+    FilterSearch,
+    SearchResults,
+    Suggestions,
+)
+from books_collection.search.service import autocomplete, search_catalog
+
+router = APIRouter(
+    prefix='/search',
+    tags=['search'],
+    dependencies=[Depends(get_current_principal)],
+)
+
+autocomplete_router = APIRouter(
+    prefix='/autocomplete',
+    tags=['search'],
+    dependencies=[Depends(get_current_principal)],
+)
+
+QueryParam = Annotated[FilterSearch, Query()]
+AutocompleteParam = Annotated[FilterAutocomplete, Query()]
+
+
+@router.get('/', status_code=HTTPStatus.OK, response_model=SearchResults)
+async def search(filters: QueryParam, session: ReadSession):
+    return ModelResponse(await search_catalog(filters, session))
+
+
+@autocomplete_router.get(
+    '/', status_code=HTTPStatus.OK, response_model=Suggestions
+)
+async def suggest(filters: AutocompleteParam):
+    return ModelResponse(await autocomplete(filters))
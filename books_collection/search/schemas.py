@@ -0,0 +1,39 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from books_collection.common.filters import FilterPage
+from books_collection.settings import settings
+
+
+class SearchResult(BaseModel):
+    kind: Literal['book', 'novelist']
+    id: int
+    text: str
+    rank: float
+
+
+class SearchResults(BaseModel):
+    results: list[SearchResult]
+    next_cursor: Optional[str] = Field(default=None)
+
+
+class FilterSearch(FilterPage):
+    q: str = Field(min_length=2, max_length=200)
+
+
+class Suggestion(BaseModel):
+    kind: Literal['book', 'novelist']
+    id: int
+    text: str
+
+
+class Suggestions(BaseModel):
+    suggestions: list[Suggestion]
+
+
+class FilterAutocomplete(BaseModel):
+    prefix: str = Field(min_length=1, max_length=200)
+    limit: int = Field(
+        default=10, gt=0, le=settings.AUTOCOMPLETE_MAX_SUGGESTIONS
+    )
@@ -0,0 +1,149 @@
+from sqlalchemy import (
+    and_,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from books_collection.book.models import Book
+from books_collection.common.exception.errors import ServiceOverloaded
+from books_collection.common.filters import like_pattern
+from books_collection.common.pagination import cursor_values, split_page
+from books_collection.database.config import read_session
+from books_collection.novelist.models import Novelist
+from books_collection.search.autocomplete import prefix_index
+from books_collection.search.schemas import (
+    FilterAutocomplete,
+    FilterSearch,
+    SearchResult,
+    SearchResults,
+    Suggestion,
+    Suggestions,
+)
+from books_collection.settings import settings
+
+TS_CONFIG = 'simple'
+
+
+# o teto de candidatos fica com os mais bem ranqueados de cada tabela; um
+# ORDER BY id descartaria bons resultados de id alto e levaria o planner a
+# varrer a chave primária em vez do índice GIN.
+def ranked_matches(kind: str, id_column, text_column, vector_column, query):
+    rank = func.ts_rank_cd(vector_column, query)
+    return (
+        select(
+            literal(kind).label('kind'),
+            id_column.label('id'),
+            text_column.label('text'),
+            rank.label('rank'),
+        )
+        .where(vector_column.op('@@')(query))
+        .order_by(rank.desc(), id_column)
+        .limit(settings.SEARCH_MAX_CANDIDATES)
+    )
+
+
+# busca nas colunas tsvector geradas (índices GIN), com teto de candidatos
+# por tabela e statement_timeout local como orçamento da consulta.
+async def search_catalog(
+    filter: FilterSearch, session: AsyncSession
+) -> SearchResults:
+    query = func.websearch_to_tsquery(TS_CONFIG, filter.q)
+
+    matches = union_all(
+        ranked_matches('book', Book.id, Book.title, Book.search_vector, query),
+        ranked_matches(
+            'novelist',
+            Novelist.id,
+            Novelist.name,
+            Novelist.search_vector,
+            query,
+        ),
+    ).subquery()
+
+    statement = select(matches)
+    if filter.after:
+        rank, kind, id = cursor_values(filter.after, float, str, int)
+        statement = statement.where(
+            or_(
+                matches.c.rank < rank,
+                and_(
+                    matches.c.rank == rank,
+                    tuple_(matches.c.kind, matches.c.id) > tuple_(kind, id),
+                ),
+            )
+        )
+
+    statement = (
+        statement.order_by(matches.c.rank.desc(), matches.c.kind, matches.c.id)
+        .offset(filter.offset)
+        .limit(filter.limit + 1)
+    )
+
+    try:
+        await session.execute(
+            text(
+                'SET LOCAL statement_timeout = '
+                f'{int(settings.SEARCH_STATEMENT_TIMEOUT_MS)}'
+            )
+        )
+        result = await session.execute(statement)
+    except OperationalError:
+        raise ServiceOverloaded('search query budget exceeded')
+
+    rows, next_cursor = split_page(
+        result.all(), filter, lambda row: (row.rank, row.kind, row.id)
+    )
+
+    return SearchResults(
+        results=[SearchResult.model_validate(row._asdict()) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+def prefix_matches(kind: str, id_column, text_column, pattern: str):
+    return select(
+        literal(kind).label('kind'),
+        id_column.label('id'),
+        text_column.label('text'),
+    ).where(text_column.ilike(pattern, escape='\\'))
+
+
+# caminho quente servido só pelo índice em memória, sem tocar o pool de
+# conexões; só enquanto ele não foi carregado (cold start) uma sessão é
+# aberta e a mesma consulta vai ao banco.
+async def autocomplete(filter: FilterAutocomplete) -> Suggestions:
+    if prefix_index.ready:
+        return Suggestions(
+            suggestions=[
+                Suggestion(kind=kind, id=id, text=text)
+                for kind, id, text in prefix_index.search(
+                    filter.prefix, filter.limit
+                )
+            ]
+        )
+
+    pattern = like_pattern(filter.prefix, prefix=True)
+    matches = union_all(
+        prefix_matches('book', Book.id, Book.title, pattern),
+        prefix_matches('novelist', Novelist.id, Novelist.name, pattern),
+    ).subquery()
+
+    async with read_session() as session:
+        result = await session.execute(
+            select(matches)
+            .order_by(func.lower(matches.c.text), matches.c.kind, matches.c.id)
+            .limit(filter.limit)
+        )
+
+    return Suggestions(
+        suggestions=[
+            Suggestion.model_validate(row._asdict()) for row in result.all()
+        ]
+    )
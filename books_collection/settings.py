@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,5 +15,54 @@ class Settings(BaseSettings):
     ALGORITHM: str
     TOKEN_TIME_EXPIRATION_SECS: int
 
+    DATABASE_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECS: int = 5
+
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    MAX_PAGE_SIZE: int = 100
+    BATCH_MAX_SIZE: int = 1000
+
+    SEARCH_STATEMENT_TIMEOUT_MS: int = 500
+    SEARCH_MAX_CANDIDATES: int = 1000
+
+    AUTOCOMPLETE_MAX_SUGGESTIONS: int = 20
+    AUTOCOMPLETE_REBUILD_SECS: int = 60
+
+    CATALOG_IMPORT_MAX_ERRORS: int = 1000
+    CATALOG_EXPORT_BATCH_SIZE: int = 500
+
+    HASHING_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    HASHING_MAX_WORKERS: int = 4
+    HASHING_MAX_QUEUE_DEPTH: int = 64
+
+    REVOCATION_REFRESH_SECS: int = 5
+    ADMIN_EMAILS: list[str] = []
+
+    PRINCIPAL_CACHE_TTL_SECS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+
+    # 'memory' é por worker: com vários workers, use 'file' num tmpfs para
+    # que a invalidação alcance todos
+    RESPONSE_CACHE_BACKEND: Literal['memory', 'file'] = 'memory'
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL_SECS: float = 30
+    RESPONSE_CACHE_STALE_SECS: float = 0
+    RESPONSE_CACHE_PATH: str = '/dev/shm/books_collection_response_cache'
+
+    RATE_LIMIT_BACKEND: Literal['memory', 'shared_memory'] = 'memory'
+    RATE_LIMIT_CAPACITY: int = 10
+    RATE_LIMIT_REFILL_PER_SEC: float = 0.5
+    RATE_LIMIT_MAX_KEYS: int = 4096
+    RATE_LIMIT_SHARED_MEMORY_PATH: str = '/dev/shm/books_collection_rate_limit'
+
 
 settings = Settings()
@@ -9,6 +9,7 @@ from alembic import context
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from books_collection.account.models import Account
+from books_collection.auth.models import RevokedToken
 from books_collection.book.models import Book
 from books_collection.novelist.models import Novelist
 from books_collection.database.tables import table_registry
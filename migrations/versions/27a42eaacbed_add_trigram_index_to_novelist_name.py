@@ -0,0 +1,29 @@
+"""add trigram index to novelist name
+
+Revision ID: 27a42eaacbed
+Revises: 0837f0eb0eae
+Create Date: 2026-10-18 10:00:00.123456
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27a42eaacbed'
+down_revision: Union[str, Sequence[str], None] = '0837f0eb0eae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_novelists_name_trgm', 'novelists', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_novelists_name_trgm', table_name='novelists', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
@@ -1,8 +1,10 @@
 from http import HTTPStatus
+from unittest.mock import patch
 
 import pytest
 
 from books_collection.account.enums import State
+from books_collection.settings import settings
 from tests.account.factories import AccountFactory
 
 
@@ -123,6 +125,26 @@ async def test_list_accounts(client, session):
     assert len(accounts) == expected_length
 
 
+@pytest.mark.asyncio
+async def test_list_accounts_not_modified_until_a_new_account(client, session):
+    session.add_all(AccountFactory.create_batch(size=3))
+    await session.commit()
+
+    first = client.get('/accounts')
+    unchanged = client.get(
+        '/accounts', headers={'If-None-Match': first.headers['ETag']}
+    )
+    session.add(AccountFactory.create())
+    await session.commit()
+    changed = client.get(
+        '/accounts', headers={'If-None-Match': first.headers['ETag']}
+    )
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers['ETag'] != first.headers['ETag']
+
+
 @pytest.mark.asyncio
 async def test_list_accounts_by_disabled_state(client, session):
     expected_length = 7
@@ -183,6 +205,36 @@ async def test_list_accounts_with_different_offset_and_limit(client, session):
     assert len(accounts) == expected_length
 
 
+@pytest.mark.asyncio
+async def test_list_accounts_with_cursor(client, session):
+    session.add_all(AccountFactory.create_batch(size=25))
+    await session.commit()
+
+    first_page = client.get('/accounts', params={'limit': 20}).json()
+    second_page = client.get(
+        '/accounts', params={'after': first_page['next_cursor']}
+    ).json()
+
+    first_ids = [account['id'] for account in first_page['accounts']]
+    second_ids = [account['id'] for account in second_page['accounts']]
+
+    assert first_ids == sorted(first_ids)
+    assert second_ids == list(range(first_ids[-1] + 1, 26))
+    assert second_page['next_cursor'] is None
+
+
+def test_list_accounts_with_invalid_cursor(client):
+    response = client.get('/accounts', params={'after': 'invalid'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_list_accounts_above_max_page_size(client):
+    response = client.get('/accounts', params={'limit': 1000})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 def test_update_account(client, account, token):
     response = client.patch(
         f'/accounts/{account.id}',
@@ -352,3 +404,66 @@ def test_delete_account_without_permissions(client, token):
     assert response.json() == {
         'detail': 'not enough permissions to delete account'
     }
+
+
+def test_update_account_password_invalidates_token(client, account, token):
+    response = client.patch(
+        f'/accounts/{account.id}',
+        json={'password': 'new_pass@123'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.patch(
+        f'/accounts/{account.id}',
+        json={'username': 'diegoj'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_create_accounts_batch_requires_admin(client, token):
+    response = client.post(
+        '/accounts/batch',
+        json=[
+            {
+                'username': 'machado',
+                'email': 'machado@email.com',
+                'password': '123456@asdfgh',
+            }
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_create_accounts_batch(client, account, token):
+    with patch.object(settings, 'ADMIN_EMAILS', [account.email]):
+        response = client.post(
+            '/accounts/batch',
+            json=[
+                {
+                    'username': 'machado',
+                    'email': 'machado@email.com',
+                    'password': '123456@asdfgh',
+                },
+                {
+                    'username': account.username,
+                    'email': 'outro@email.com',
+                    'password': '123456@asdfgh',
+                },
+            ],
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    body = response.json()
+    assert response.status_code == HTTPStatus.OK
+    assert body['created'] == body['failed'] == 1
+    assert body['items'][0]['item']['username'] == 'machado'
+    assert body['items'][1]['detail'] == (
+        f'username: {account.username} is already in use'
+    )
@@ -1,9 +1,21 @@
+from http import HTTPStatus
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
-from psycopg.errors import UniqueViolation
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
-
+from sqlalchemy.orm import Session
+
+from books_collection.account.benchmark import (
+    build_engine,
+    orm_page,
+    requests_per_sec,
+    row_page,
+    run_candidate,
+    serialization_app,
+)
 from books_collection.account.enums import State
 from books_collection.account.models import Account
 from books_collection.account.schemas import (
@@ -13,40 +25,59 @@ from books_collection.account.schemas import (
 )
 from books_collection.account.service import (
     create_account,
+    create_accounts,
     delete_account,
     list_accounts,
     update_account,
 )
+from books_collection.auth.hashing import hashing_pool
+from books_collection.auth.principal import Principal, principal_cache
 from books_collection.common.exception.errors import (
     DuplicatedRegistry,
     ForbidenOperation,
 )
+from books_collection.common.pagination import decode_cursor
 from tests.account.factories import AccountFactory, AccountRequestFactory
 
 
+def execute_results(*rows):
+    results = []
+    for row in rows:
+        result = MagicMock()
+        result.first.return_value = row
+        results.append(result)
+    return results
+
+
 @pytest.mark.asyncio
 async def test_create_account_successfully(mock_session):
     request = AccountRequestFactory.create(password='123@123ddd')
     hashed_password = 'hashed_pass_4321'
+    mock_session.execute.side_effect = execute_results(
+        SimpleNamespace(
+            id=1,
+            username=request.username,
+            email=request.email,
+            state=State.enabled,
+        )
+    )
 
-    def refresh_side_effect(account_obj):
-        account_obj.id = 1
-
-    mock_session.refresh.side_effect = refresh_side_effect
-
-    with patch(
-        'books_collection.account.service.hash_password',
-        return_value=hashed_password,
+    with patch.object(
+        hashing_pool, 'hash', return_value=hashed_password
     ) as mock_hash_password:
         created_account = await create_account(request, mock_session)
 
     mock_hash_password.assert_called_once_with('123@123ddd')
-    mock_session.add.assert_called_once()
-    added_account = mock_session.add.call_args[0][0]
+    statement = mock_session.execute.call_args[0][0]
+    query = str(statement.compile(dialect=postgresql.dialect()))
+    assert query.startswith('INSERT INTO accounts')
+    assert 'ON CONFLICT DO NOTHING RETURNING accounts.id' in query
+    assert statement.compile().params['password'] == hashed_password
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(added_account)
+    mock_session.add.assert_not_called()
+    mock_session.refresh.assert_not_awaited()
 
-    assert isinstance(added_account, Account)
     assert created_account.id == 1
     assert created_account.username == request.username
     assert created_account.email == request.email
@@ -58,53 +89,42 @@ async def test_create_account_successfully(mock_session):
 async def test_create_account_with_in_use_username(mock_session):
     request = AccountRequestFactory.create()
     exc_msg = f'username: {request.username} is already in use'
-    unique_exc = UniqueViolation('accounts_username_key')
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=unique_exc
+    mock_session.execute.side_effect = execute_results(
+        None, SimpleNamespace(username=request.username, email='x@x.com')
     )
 
     with pytest.raises(DuplicatedRegistry, match=exc_msg):
         await create_account(request, mock_session)
 
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
-    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+    mock_session.rollback.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_create_account_with_in_use_email(mock_session):
     request = AccountRequestFactory.create()
     exc_msg = f'email: {request.email} is already in use'
-    unique_exc = UniqueViolation('accounts_email_key')
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=unique_exc
+    mock_session.execute.side_effect = execute_results(
+        None, SimpleNamespace(username='someone', email=request.email)
     )
 
     with pytest.raises(DuplicatedRegistry, match=exc_msg):
         await create_account(request, mock_session)
 
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
-    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+    mock_session.rollback.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_create_account_with_generic_unique_constraint(mock_session):
+async def test_create_account_conflict_without_visible_row(mock_session):
     request = AccountRequestFactory.create()
     exc_msg = 'username or email is already in use'
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=UniqueViolation('anything')
-    )
+    mock_session.execute.side_effect = execute_results(None, None)
 
     with pytest.raises(DuplicatedRegistry, match=exc_msg):
         await create_account(request, mock_session)
 
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
-    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -114,18 +134,53 @@ async def test_list_accounts_default_filters(mock_session):
     for i, account in enumerate(accounts_list):
         account.id = i + 1
 
-    mock_scalar_result = MagicMock()
-    mock_scalar_result.all.return_value = accounts_list
-    mock_session.scalars.return_value = mock_scalar_result
+    mock_result = MagicMock()
+    mock_result.all.return_value = accounts_list
+    mock_session.execute.return_value = mock_result
 
     response = await list_accounts(FilterAccount(), mock_session)
 
-    mock_session.scalars.assert_awaited_once()
-    mock_session.scalars.return_value.all.assert_called_once()
+    mock_session.execute.assert_awaited_once()
+    mock_session.execute.return_value.all.assert_called_once()
     assert len(response.accounts) == expected_size
     assert response.accounts[0].id == accounts_list[0].id
 
 
+@pytest.mark.asyncio
+async def test_list_accounts_selects_only_response_columns(mock_session):
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    await list_accounts(FilterAccount(), mock_session)
+
+    statement = mock_session.execute.call_args[0][0]
+    assert [column.name for column in statement.selected_columns] == [
+        'id',
+        'username',
+        'email',
+        'state',
+        'updated_at',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_accounts_with_next_cursor(mock_session):
+    query = FilterAccount(limit=2)
+    accounts_list = AccountFactory.create_batch(size=3)
+    for i, account in enumerate(accounts_list):
+        account.id = i + 1
+
+    mock_result = MagicMock()
+    mock_result.all.return_value = accounts_list
+    mock_session.execute.return_value = mock_result
+
+    response = await list_accounts(query, mock_session)
+
+    assert [account.id for account in response.accounts] == [1, 2]
+    assert decode_cursor(response.next_cursor) == [2]
+
+
 @pytest.mark.asyncio
 async def test_list_accounts_with_state_filter(mock_session):
     expected_size = 3
@@ -134,42 +189,133 @@ async def test_list_accounts_with_state_filter(mock_session):
     for i, account in enumerate(accounts_list):
         account.id = i + 1
 
-    mock_scalar_result = MagicMock()
-    mock_scalar_result.all.return_value = accounts_list
-    mock_session.scalars.return_value = mock_scalar_result
+    mock_result = MagicMock()
+    mock_result.all.return_value = accounts_list
+    mock_session.execute.return_value = mock_result
 
     response = await list_accounts(query, mock_session)
 
-    mock_session.scalars.assert_awaited_once()
-    mock_session.scalars.return_value.all.assert_called_once()
+    mock_session.execute.assert_awaited_once()
+    mock_session.execute.return_value.all.assert_called_once()
 
     assert len(response.accounts) == expected_size
     assert response.accounts[0].state == accounts_list[0].state
 
 
+def updated_row(account: Account, **values):
+    return SimpleNamespace(
+        id=account.id,
+        username=values.get('username', account.username),
+        email=values.get('email', account.email),
+        state=values.get('state', account.state),
+    )
+
+
+def compiled_update(mock_session):
+    statement = mock_session.execute.call_args[0][0]
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def integrity_error(constraint: str | None) -> IntegrityError:
+    orig = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint))
+    return IntegrityError('statement', {}, orig)
+
+
 @pytest.mark.asyncio
 async def test_update_account_successfully(mock_session):
     new_email = 'fulano@email.com'
     account_to_update = AccountUpdate(email=new_email)
     db_account = AccountFactory.create()
     db_account.id = 1
-
-    def refresh_side_effect(account_obj):
-        account_obj.id = 1
-
-    mock_session.refresh.side_effect = refresh_side_effect
+    mock_session.execute.side_effect = execute_results(
+        updated_row(db_account, email=new_email)
+    )
 
     updated_account = await update_account(
         1, account_to_update, db_account, mock_session
     )
 
+    query = str(compiled_update(mock_session))
+    assert query.startswith('UPDATE accounts SET email=')
+    assert 'username=' not in query
+    assert 'RETURNING accounts.id' in query
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(db_account)
+    mock_session.refresh.assert_not_awaited()
 
     assert updated_account.id == 1
     assert updated_account.email == new_email
 
 
+@pytest.mark.asyncio
+async def test_update_account_password_bumps_security_version(mock_session):
+    db_account = AccountFactory.create()
+    db_account.id = 1
+    hashed_password = 'hashed_pass_4321'
+    mock_session.execute.side_effect = execute_results(updated_row(db_account))
+
+    with patch.object(
+        hashing_pool, 'hash', return_value=hashed_password
+    ) as mock_hash_password:
+        await update_account(
+            1, AccountUpdate(password='1234@asddfg'), db_account, mock_session
+        )
+
+    compiled = compiled_update(mock_session)
+    mock_hash_password.assert_called_once_with('1234@asddfg')
+    assert compiled.params['password'] == hashed_password
+    assert (
+        'security_version=(accounts.security_version + %(security_version_1)s'
+        in str(compiled)
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_account_disable_bumps_security_version(mock_session):
+    db_account = AccountFactory.create(state=State.enabled)
+    db_account.id = 1
+    mock_session.execute.side_effect = execute_results(
+        updated_row(db_account, state=State.disabled)
+    )
+
+    await update_account(
+        1, AccountUpdate(state=State.disabled), db_account, mock_session
+    )
+
+    assert 'security_version=' in str(compiled_update(mock_session))
+
+
+@pytest.mark.asyncio
+async def test_update_account_keeps_security_version(mock_session):
+    db_account = AccountFactory.create()
+    db_account.id = 1
+    mock_session.execute.side_effect = execute_results(
+        updated_row(db_account, username='fulano')
+    )
+
+    await update_account(
+        1, AccountUpdate(username='fulano'), db_account, mock_session
+    )
+
+    assert 'security_version=' not in str(compiled_update(mock_session))
+
+
+@pytest.mark.asyncio
+async def test_update_account_evicts_cached_principal(mock_session):
+    db_account = AccountFactory.create()
+    db_account.id = 1
+    principal_cache.set(db_account.id, Principal.from_account(db_account))
+    mock_session.execute.side_effect = execute_results(
+        updated_row(db_account, state=State.disabled)
+    )
+
+    await update_account(
+        1, AccountUpdate(state=State.disabled), db_account, mock_session
+    )
+
+    assert principal_cache.get(db_account.id) is None
+
+
 @pytest.mark.asyncio
 async def test_update_account_with_in_use_username(mock_session):
     new_username = 'fulano'
@@ -177,16 +323,12 @@ async def test_update_account_with_in_use_username(mock_session):
     account_to_update = AccountUpdate(username=new_username)
     db_account = AccountFactory.create()
     db_account.id = 1
-    unique_exc = UniqueViolation('accounts_username_key')
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=unique_exc
-    )
+    mock_session.execute.side_effect = integrity_error('accounts_username_key')
 
     with pytest.raises(DuplicatedRegistry, match=expected_msg):
         await update_account(1, account_to_update, db_account, mock_session)
 
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
+    mock_session.commit.assert_not_awaited()
     mock_session.rollback.assert_awaited_once()
 
 
@@ -197,16 +339,12 @@ async def test_update_account_with_in_use_email(mock_session):
     account_to_update = AccountUpdate(email=new_email)
     db_account = AccountFactory.create()
     db_account.id = 1
-    unique_exc = UniqueViolation('accounts_email_key')
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=unique_exc
-    )
+    mock_session.execute.side_effect = integrity_error('accounts_email_key')
 
     with pytest.raises(DuplicatedRegistry, match=expected_msg):
         await update_account(1, account_to_update, db_account, mock_session)
 
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
+    mock_session.commit.assert_not_awaited()
     mock_session.rollback.assert_awaited_once()
 
 
@@ -217,15 +355,11 @@ async def test_update_account_with_generic_unique_constraint(mock_session):
     account_to_update = AccountUpdate(email=new_email)
     db_account = AccountFactory.create()
     db_account.id = 1
-    mock_session.commit.side_effect = IntegrityError(
-        statement='statment', params=['any'], orig=UniqueViolation('anything')
-    )
+    mock_session.execute.side_effect = integrity_error(None)
 
     with pytest.raises(DuplicatedRegistry, match=exc_msg):
         await update_account(1, account_to_update, db_account, mock_session)
 
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_not_awaited()
     mock_session.rollback.assert_awaited_once()
 
 
@@ -252,6 +386,17 @@ async def test_delete_account_successfully(mock_session):
     mock_session.commit.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_delete_account_evicts_cached_principal(mock_session):
+    db_account = AccountFactory.create()
+    db_account.id = 1
+    principal_cache.set(db_account.id, Principal.from_account(db_account))
+
+    await delete_account(1, db_account, mock_session)
+
+    assert principal_cache.get(db_account.id) is None
+
+
 @pytest.mark.asyncio
 async def test_delete_account_not_enough_permission(mock_session):
     exc_msg = 'not enough permissions to delete account'
@@ -262,3 +407,80 @@ async def test_delete_account_not_enough_permission(mock_session):
 
     mock_session.delete.assert_not_awaited()
     mock_session.commit.assert_not_awaited()
+
+
+def test_list_page_benchmark_paths_agree():
+    engine = build_engine(rows=30)
+
+    with Session(engine) as session:
+        orm = orm_page(session, 20)
+    with Session(engine) as session:
+        rows = row_page(session, 20)
+
+    assert orm == rows
+    assert run_candidate(engine, row_page, 20, iterations=2)['peak_kib'] > 0
+
+
+@pytest.mark.asyncio
+async def test_serialization_benchmark_paths_agree():
+    expected_size = 5
+    engine = build_engine(rows=expected_size)
+    with Session(engine) as session:
+        app = serialization_app(row_page(session, expected_size))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://test'
+    ) as client:
+        before = await client.get('/before')
+        after = await client.get('/after')
+
+    assert before.json() == after.json()
+    assert len(after.json()['accounts']) == expected_size
+    assert await requests_per_sec(app, '/after', 2) > 0
+
+
+@pytest.mark.asyncio
+async def test_create_accounts_reports_each_item(mock_session):
+    requests = [
+        AccountRequestFactory.create(username='machado', email='m@a.com'),
+        AccountRequestFactory.create(username='machado', email='o@a.com'),
+        AccountRequestFactory.create(username='clarice', email='c@l.com'),
+        AccountRequestFactory.create(username='rachel', email='r@q.com'),
+    ]
+    mock_session.execute.side_effect = [
+        [
+            SimpleNamespace(
+                id=1, username='machado', email='m@a.com', state=State.enabled
+            )
+        ],
+        [SimpleNamespace(username='outra', email='c@l.com')],
+    ]
+
+    with patch.object(
+        hashing_pool, 'hash_many', return_value=['h1', 'h2', 'h3']
+    ) as mock_hash_many:
+        response = await create_accounts(requests, mock_session)
+
+    mock_hash_many.assert_awaited_once_with([
+        requests[0].password,
+        requests[2].password,
+        requests[3].password,
+    ])
+    statement, params = mock_session.execute.call_args_list[0][0]
+    query = str(statement.compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT DO NOTHING RETURNING accounts.id' in query
+    assert [account['password'] for account in params] == ['h1', 'h2', 'h3']
+    mock_session.commit.assert_awaited_once()
+
+    assert [item.status for item in response.items] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CONFLICT,
+    ]
+    assert response.items[1].detail == (
+        'username: machado is repeated in this batch'
+    )
+    assert response.items[2].detail == 'email: c@l.com is already in use'
+    assert response.items[3].detail == 'username or email is already in use'
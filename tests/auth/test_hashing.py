@@ -0,0 +1,77 @@
+import pytest
+
+from books_collection.auth.benchmark import run_candidate
+from books_collection.auth.hashing import (
+    HashingPool,
+    build_context,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+from books_collection.common.exception.errors import ServiceOverloaded
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_hash_and_verify():
+    pool = HashingPool(executor='thread', max_workers=2, max_queue_depth=4)
+    plain_pass = '123456@asdfgh'
+
+    hashed_pass = await pool.hash(plain_pass)
+
+    assert hashed_pass != plain_pass
+    assert await pool.verify(plain_pass, hashed_pass)
+    assert not await pool.verify('wrong_password', hashed_pass)
+
+    stats = pool.stats()
+    pool.shutdown()
+
+    expected_completed = 3
+    assert stats['completed'] == expected_completed
+    assert stats['in_flight'] == 0
+    assert stats['rejected'] == 0
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_queue_is_full():
+    pool = HashingPool(executor='thread', max_workers=1, max_queue_depth=0)
+
+    with pytest.raises(ServiceOverloaded, match='hashing is overloaded'):
+        await pool.hash('123456@asdfgh')
+
+    assert pool.stats()['rejected'] == 1
+    assert pool.stats()['submitted'] == 0
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_hash_many_stays_within_workers():
+    pool = HashingPool(executor='thread', max_workers=2, max_queue_depth=2)
+    passwords = [f'123456@asdfg{number}' for number in range(6)]
+
+    hashed = await pool.hash_many(passwords)
+
+    stats = pool.stats()
+    pool.shutdown()
+
+    assert len(hashed) == len(passwords)
+    assert all(
+        verify_password(plain, hashed_pass)
+        for plain, hashed_pass in zip(passwords, hashed)
+    )
+    assert stats['rejected'] == 0
+    assert stats['peak_in_flight'] == pool.max_workers
+
+
+def test_needs_rehash_with_outdated_parameters():
+    old_context = build_context(time_cost=1, memory_cost=8192, parallelism=1)
+
+    assert needs_rehash(old_context.hash('123456@asdfgh'))
+    assert not needs_rehash(hash_password('123456@asdfgh'))
+
+
+def test_benchmark_candidate_report():
+    result = run_candidate(
+        time_cost=1, memory_cost=8192, parallelism=1, iterations=4, workers=2
+    )
+
+    assert result['hashes_per_sec'] > 0
+    assert result['verify_p99_ms'] >= result['verify_p50_ms'] > 0
@@ -0,0 +1,66 @@
+from books_collection.account.enums import State
+from books_collection.auth.principal import Principal, PrincipalCache
+
+
+def make_principal(id: int) -> Principal:
+    return Principal(
+        id=id,
+        email=f'user-{id}@email.com',
+        username=f'user-{id}',
+        state=State.enabled,
+        version=1,
+    )
+
+
+def test_principal_cache_hit_and_miss():
+    cache = PrincipalCache(max_size=10, ttl_secs=30)
+    principal = make_principal(1)
+
+    assert cache.get(principal.id) is None
+    cache.set(principal.id, principal)
+
+    assert cache.get(principal.id) == principal
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_principal_cache_expires_entries_after_ttl(clock):
+    cache = PrincipalCache(max_size=10, ttl_secs=30, clock=clock)
+    principal = make_principal(1)
+    cache.set(principal.id, principal)
+
+    clock.now += 29
+    assert cache.get(principal.id) == principal
+
+    clock.now += 1
+    assert cache.get(principal.id) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_principal_cache_discards_least_recently_used():
+    cache = PrincipalCache(max_size=2, ttl_secs=30)
+    first, second, third = (
+        make_principal(1),
+        make_principal(2),
+        make_principal(3),
+    )
+    cache.set(first.id, first)
+    cache.set(second.id, second)
+    cache.get(first.id)
+
+    cache.set(third.id, third)
+
+    assert cache.get(second.id) is None
+    assert cache.get(first.id) == first
+    assert cache.get(third.id) == third
+
+
+def test_principal_cache_evict():
+    cache = PrincipalCache(max_size=10, ttl_secs=30)
+    principal = make_principal(1)
+    cache.set(principal.id, principal)
+
+    cache.evict(principal.id)
+
+    assert cache.get(principal.id) is None
+    assert cache.stats()['evictions'] == 1
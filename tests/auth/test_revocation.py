@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from books_collection.auth import revocation as module
+from books_collection.auth.revocation import RevocationList
+
+
+def test_revocation_list_add_and_check(clock):
+    revocation_list = RevocationList(clock=clock)
+    revocation_list.add('jti-1', 1300.0)
+
+    assert revocation_list.is_revoked('jti-1')
+    assert not revocation_list.is_revoked('jti-2')
+
+
+def test_revocation_list_ignores_expired_tokens(clock):
+    revocation_list = RevocationList(clock=clock)
+    revocation_list.add('jti-1', 900.0)
+    revocation_list.add('jti-2', 1300.0)
+
+    assert not revocation_list.is_revoked('jti-1')
+    assert len(revocation_list) == 1
+
+    clock.now = 1300.0
+    assert not revocation_list.is_revoked('jti-2')
+    assert len(revocation_list) == 0
+
+
+def test_revocation_list_prune(clock):
+    revocation_list = RevocationList(clock=clock)
+    revocation_list.add('jti-1', 1100.0)
+    revocation_list.add('jti-2', 1300.0)
+
+    clock.now = 1200.0
+    revocation_list.prune()
+
+    assert len(revocation_list) == 1
+    assert revocation_list.is_revoked('jti-2')
+
+
+def revoked_rows(*rows):
+    return [
+        (jti, datetime.fromtimestamp(expires_at, tz=timezone.utc))
+        for jti, expires_at in rows
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rereads_every_unexpired_revocation(mock_session, clock):
+    revocation_list = RevocationList(clock=clock)
+    mock_session.execute.side_effect = [
+        revoked_rows(('jti-2', 1300.0)),
+        # commit tardio de uma revogação mais antiga que a já vista
+        revoked_rows(('jti-1', 1300.0), ('jti-2', 1300.0)),
+    ]
+
+    await revocation_list.refresh(mock_session)
+    await revocation_list.refresh(mock_session)
+
+    expected_size = 2
+    assert revocation_list.is_revoked('jti-1')
+    assert len(revocation_list) == expected_size
+
+    query = str(
+        mock_session.execute.await_args.args[0].compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert 'WHERE revoked_tokens.expires_at >' in query
+
+
+@pytest.mark.asyncio
+async def test_sync_revocation_list_logs_failures(monkeypatch, caplog):
+    calls = 0
+
+    def broken_factory():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise asyncio.CancelledError
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(module.settings, 'REVOCATION_REFRESH_SECS', 0)
+    monkeypatch.setattr(module, 'session_factory', broken_factory)
+
+    with pytest.raises(asyncio.CancelledError):
+        await module.sync_revocation_list()
+
+    assert 'revocation list sync failed' in caplog.text
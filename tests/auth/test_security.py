@@ -5,11 +5,13 @@ from fastapi.exceptions import HTTPException
 from freezegun import freeze_time
 from jwt import decode
 
+from books_collection.account.enums import State
+from books_collection.auth.hashing import hash_password, verify_password
+from books_collection.auth.principal import Principal, principal_cache
 from books_collection.auth.security import (
     create_access_token,
     get_current_account,
-    hash_password,
-    verify_password,
+    get_current_principal,
 )
 from books_collection.settings import settings
 
@@ -35,6 +37,25 @@ def test_create_token():
     assert decoded_token.get('sub') == email
 
 
+def test_create_token_with_principal_claims():
+    principal = Principal(
+        id=1,
+        email='xx@email.com',
+        username='xx',
+        state=State.enabled,
+        version=3,
+    )
+    token, _ = create_access_token(data=principal.claims())
+
+    decoded_token = decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
+
+    assert decoded_token.get('sub') == principal.email
+    assert decoded_token.get('uid') == principal.id
+    assert decoded_token.get('ver') == principal.version
+
+
 def test_create_token_valid_expiration_time():
     token, expires_in = create_access_token(data={'sub': 'email'})
 
@@ -85,3 +106,48 @@ async def test_get_current_account_with_not_found_account(session):
     token, _ = create_access_token(data={'sub': 'another_email@mail.com'})
     with pytest.raises(HTTPException, match='Could not validate credentials'):
         await get_current_account(session, token)
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_is_cached(session, account):
+    principal = Principal.from_account(account)
+    token, _ = create_access_token(data=principal.claims())
+    await get_current_principal(session, token)
+
+    await session.delete(account)
+    await session.commit()
+
+    cached_principal = await get_current_principal(session, token)
+
+    assert cached_principal == principal
+    assert principal_cache.stats()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_account_with_evicted_deleted_account(
+    session, account
+):
+    token, _ = create_access_token(
+        data=Principal.from_account(account).claims()
+    )
+    await get_current_principal(session, token)
+
+    await session.delete(account)
+    await session.commit()
+
+    with pytest.raises(HTTPException, match='Could not validate credentials'):
+        await get_current_account(session, token)
+
+    assert principal_cache.get(account.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_with_outdated_version(session, account):
+    token, _ = create_access_token(
+        data=Principal.from_account(account).claims()
+    )
+    account.security_version += 1
+    await session.commit()
+
+    with pytest.raises(HTTPException, match='Could not validate credentials'):
+        await get_current_principal(session, token)
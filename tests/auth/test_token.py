@@ -1,8 +1,14 @@
 from datetime import timedelta
 from http import HTTPStatus
+from unittest.mock import patch
 
+import pytest
 from freezegun import freeze_time
 
+from books_collection.auth.hashing import hashing_pool
+from books_collection.auth.revocation import revocation_list
+from books_collection.settings import settings
+
 
 def test_login(account, client):
     response = client.post(
@@ -127,3 +133,113 @@ def test_refresh_token_missing_authorization_header(client):
 
     assert response_refresh.status_code == HTTPStatus.UNAUTHORIZED
     assert response_refresh.json() == {'detail': 'Not authenticated'}
+
+
+def test_login_rate_limited(account, client):
+    for _ in range(settings.RATE_LIMIT_CAPACITY):
+        client.post(
+            '/auth/token',
+            data={'username': account.email, 'password': 'wrong_password'},
+        )
+
+    response = client.post(
+        '/auth/token',
+        data={
+            'username': account.email,
+            'password': account.plain_password,
+        },
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_login_with_saturated_hashing_pool(account, client):
+    with patch.object(hashing_pool, 'is_saturated', return_value=True):
+        response = client.post(
+            '/auth/token',
+            data={
+                'username': account.email,
+                'password': account.plain_password,
+            },
+        )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_login_rehashes_outdated_password(account, client):
+    with (
+        patch('books_collection.auth.router.rehash_password') as mock_rehash,
+        patch('books_collection.auth.router.needs_rehash', return_value=True),
+    ):
+        response = client.post(
+            '/auth/token',
+            data={
+                'username': account.email,
+                'password': account.plain_password,
+            },
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    mock_rehash.assert_called_once_with(
+        account.id, account.plain_password, account.password
+    )
+
+
+def test_logout(client, token):
+    response = client.post(
+        '/auth/logout', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+    response = client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+@pytest.mark.asyncio
+async def test_logout_is_persisted(client, token, session):
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+    await revocation_list.rebuild(session)
+
+    response = client.post(
+        '/auth/refresh_token',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_revoke_token_without_admin_permissions(client, token):
+    response = client.post(
+        '/auth/revoke',
+        json={'jti': 'any'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {
+        'detail': 'not enough permissions to revoke tokens'
+    }
+
+
+def test_revoke_account_tokens(client, account, token):
+    with patch.object(settings, 'ADMIN_EMAILS', [account.email]):
+        response = client.post(
+            '/auth/revoke',
+            json={'account_id': account.id},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+    response = client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
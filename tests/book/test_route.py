@@ -0,0 +1,152 @@
+from http import HTTPStatus
+
+import pytest
+
+from books_collection.book.models import Book
+from books_collection.novelist.models import Novelist
+
+
+async def add_books(session) -> list[Novelist]:
+    machado = Novelist(name='Machado de Assis')
+    clarice = Novelist(name='Clarice Lispector')
+    session.add_all([machado, clarice])
+    await session.flush()
+    session.add_all([
+        Book(year=1881, title='Memórias Póstumas', novelist_id=machado.id),
+        Book(year=1891, title='Quincas Borba', novelist_id=machado.id),
+        Book(year=1899, title='Dom Casmurro', novelist_id=machado.id),
+        Book(year=1977, title='A Hora da Estrela', novelist_id=clarice.id),
+    ])
+    await session.commit()
+    return [machado, clarice]
+
+
+@pytest.mark.asyncio
+async def test_create_book(client, session, token):
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.commit()
+
+    response = client.post(
+        '/books',
+        json={
+            'year': 1899,
+            'title': 'Dom Casmurro',
+            'novelistId': novelist.id,
+        },
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        'id': response.json()['id'],
+        'year': 1899,
+        'title': 'Dom Casmurro',
+        'novelistId': novelist.id,
+        'novelist': None,
+    }
+
+
+def test_create_book_with_unknown_novelist(client, token):
+    response = client.post(
+        '/books',
+        json={'year': 1899, 'title': 'Dom Casmurro', 'novelistId': 99},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_list_books_by_novelist_and_years(
+    client, session, token, statements
+):
+    machado, _ = await add_books(session)
+    statements.clear()
+
+    response = client.get(
+        '/books',
+        params={
+            'novelist_id': machado.id,
+            'year_from': 1885,
+            'year_to': 1900,
+            'limit': 1,
+        },
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [book['title'] for book in response.json()['books']] == [
+        'Quincas Borba'
+    ]
+    assert response.json()['next_cursor']
+    assert len(statements) == 1
+    assert 'novelists' not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_list_books_expanding_novelist(
+    client, session, token, statements
+):
+    await add_books(session)
+    statements.clear()
+
+    response = client.get(
+        '/books',
+        params={'expand': 'novelist'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    expected_statements = 2
+    assert response.status_code == HTTPStatus.OK
+    assert {book['novelist']['name'] for book in response.json()['books']} == {
+        'Machado de Assis',
+        'Clarice Lispector',
+    }
+    assert len(statements) == expected_statements
+
+
+@pytest.mark.asyncio
+async def test_list_books_expanded_etag_changes_after_novelist_rename(
+    client, session, token
+):
+    await add_books(session)
+    headers = {'Authorization': f'Bearer {token}'}
+    params = {'expand': 'novelist'}
+
+    first = client.get('/books', params=params, headers=headers)
+    novelist_id = first.json()['books'][0]['novelist']['id']
+    client.patch(
+        f'/novelists/{novelist_id}',
+        json={'name': 'Joaquim Maria Machado de Assis'},
+        headers=headers,
+    )
+    second = client.get(
+        '/books',
+        params=params,
+        headers={**headers, 'If-None-Match': first.headers['ETag']},
+    )
+
+    assert second.status_code == HTTPStatus.OK
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert 'Joaquim Maria Machado de Assis' in {
+        book['novelist']['name'] for book in second.json()['books']
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_book(client, session, token):
+    await add_books(session)
+    headers = {'Authorization': f'Bearer {token}'}
+    book_id = client.get('/books', headers=headers).json()['books'][0]['id']
+
+    updated = client.patch(
+        f'/books/{book_id}', json={'year': 1882}, headers=headers
+    )
+    deleted = client.delete(f'/books/{book_id}', headers=headers)
+    missing = client.get(f'/books/{book_id}', headers=headers)
+
+    expected_year = 1882
+    assert updated.json()['year'] == expected_year
+    assert deleted.status_code == HTTPStatus.NO_CONTENT
+    assert missing.status_code == HTTPStatus.NOT_FOUND
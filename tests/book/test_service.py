@@ -0,0 +1,286 @@
+from datetime import datetime
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from books_collection.book.schemas import (
+    BookRequest,
+    BookUpdate,
+    FilterBook,
+)
+from books_collection.book.service import (
+    create_book,
+    create_books,
+    delete_book,
+    list_books,
+    update_book,
+)
+from books_collection.common.conditional import Conditional
+from books_collection.common.exception.errors import (
+    DuplicatedRegistry,
+    RegistryNotFound,
+)
+from books_collection.common.pagination import decode_cursor
+from books_collection.search.autocomplete import prefix_index
+
+
+def compiled_query(mock_call) -> str:
+    statement = mock_call.call_args[0][0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+# o service lê a constraint violada de ex.orig.diag, como o psycopg expõe
+def integrity_error(constraint: str) -> IntegrityError:
+    orig = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint))
+    return IntegrityError('statement', {}, orig)
+
+
+def make_row(id: int, title: str, year: int = 1900, novelist_id: int = 1):
+    return SimpleNamespace(
+        id=id, title=title, year=year, novelist_id=novelist_id
+    )
+
+
+def test_book_request_accepts_camel_case_novelist_id():
+    book = BookRequest.model_validate({
+        'year': 1899,
+        'title': 'Dom Casmurro',
+        'novelistId': 1,
+    })
+
+    assert book.novelist_id == 1
+
+
+def test_book_request_rejects_year_out_of_range():
+    with pytest.raises(ValidationError):
+        BookRequest(year=99, title='Dom Casmurro', novelist_id=1)
+
+
+def test_filter_book_rejects_inverted_year_range():
+    with pytest.raises(ValidationError, match='year_from'):
+        FilterBook(year_from=1900, year_to=1800)
+
+
+@pytest.mark.asyncio
+async def test_create_book_successfully(mock_session):
+    prefix_index.build([], [])
+
+    def add_side_effect(book):
+        book.id = 7
+
+    mock_session.add.side_effect = add_side_effect
+
+    response = await create_book(
+        BookRequest(year=1899, title='Dom Casmurro', novelist_id=1),
+        mock_session,
+    )
+
+    expected_id = 7
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_called()
+    assert response.id == expected_id
+    assert response.model_dump(by_alias=True)['novelistId'] == 1
+    assert prefix_index.search('dom', limit=1) == [('book', 7, 'Dom Casmurro')]
+
+
+@pytest.mark.asyncio
+async def test_create_book_with_duplicated_title(mock_session):
+    mock_session.commit.side_effect = integrity_error('books_title_key')
+
+    with pytest.raises(DuplicatedRegistry, match='title: Dom Casmurro'):
+        await create_book(
+            BookRequest(year=1899, title='Dom Casmurro', novelist_id=1),
+            mock_session,
+        )
+
+    mock_session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_book_with_unknown_novelist(mock_session):
+    mock_session.commit.side_effect = integrity_error('books_novelist_id_fkey')
+
+    with pytest.raises(RegistryNotFound, match='novelist not found'):
+        await create_book(
+            BookRequest(year=1899, title='Dom Casmurro', novelist_id=99),
+            mock_session,
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_books_by_novelist_and_year_range(mock_session):
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        make_row(1, 'Dom Casmurro'),
+        make_row(2, 'Quincas Borba'),
+    ]
+    mock_session.execute.return_value = mock_result
+
+    response = await list_books(
+        FilterBook(novelist_id=1, year_from=1880, year_to=1900, limit=1),
+        mock_session,
+    )
+
+    query = compiled_query(mock_session.execute)
+    assert query.startswith(
+        'SELECT books.id, books.title, books.year, books.novelist_id, '
+        'books.updated_at \nFROM'
+    )
+    assert 'books.novelist_id = ' in query
+    assert 'books.year >= ' in query
+    assert 'books.year <= ' in query
+    assert 'novelists' not in query
+    assert [book.title for book in response.books] == ['Dom Casmurro']
+    assert response.books[0].novelist is None
+    assert decode_cursor(response.next_cursor) == [1]
+
+
+@pytest.mark.asyncio
+async def test_list_books_expanding_novelist(mock_session):
+    book = SimpleNamespace(
+        **vars(make_row(1, 'Dom Casmurro')),
+        novelist=SimpleNamespace(id=1, name='Machado de Assis'),
+    )
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [book]
+    mock_session.execute.return_value = mock_result
+
+    response = await list_books(FilterBook(expand='novelist'), mock_session)
+
+    query = compiled_query(mock_session.execute)
+    assert 'JOIN' not in query
+    assert response.books[0].novelist.name == 'Machado de Assis'
+
+
+@pytest.mark.asyncio
+async def test_list_books_expanded_etag_tracks_novelist(mock_session):
+    async def etag_for(novelist_updated_at: datetime) -> str:
+        book = SimpleNamespace(
+            **vars(make_row(1, 'Dom Casmurro')),
+            updated_at=datetime(2026, 1, 1),
+            novelist=SimpleNamespace(
+                id=1, name='Machado de Assis', updated_at=novelist_updated_at
+            ),
+        )
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [book]
+        mock_session.execute.return_value = mock_result
+        conditional = Conditional()
+
+        await list_books(
+            FilterBook(expand='novelist'), mock_session, conditional
+        )
+        return conditional.etag
+
+    before = await etag_for(datetime(2026, 1, 1))
+    after = await etag_for(datetime(2026, 2, 1))
+
+    assert before != after
+
+
+@pytest.mark.asyncio
+async def test_update_book_in_one_statement(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = make_row(1, 'Dom Casmurro', 1899, 2)
+    mock_session.execute.return_value = mock_result
+
+    response = await update_book(1, BookUpdate(novelist_id=2), mock_session)
+
+    query = compiled_query(mock_session.execute)
+    assert query.startswith('UPDATE books SET novelist_id=')
+    assert 'title=' not in query
+    assert 'WHERE books.id = ' in query
+    assert 'RETURNING books.id, books.title' in query
+    expected_novelist_id = 2
+    assert response.novelist_id == expected_novelist_id
+    assert response.title == 'Dom Casmurro'
+    mock_session.commit.assert_awaited_once()
+    mock_session.scalar.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_book_not_found(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    with pytest.raises(RegistryNotFound, match='book not found'):
+        await update_book(1, BookUpdate(year=1900), mock_session)
+
+
+@pytest.mark.asyncio
+async def test_update_book_with_duplicated_title(mock_session):
+    mock_session.execute.side_effect = integrity_error('books_title_key')
+
+    with pytest.raises(DuplicatedRegistry, match='title: Dom Casmurro'):
+        await update_book(1, BookUpdate(title='Dom Casmurro'), mock_session)
+
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_book_not_found(mock_session):
+    mock_session.scalar.return_value = None
+
+    with pytest.raises(RegistryNotFound, match='book not found'):
+        await delete_book(1, mock_session)
+
+    mock_session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_books_reports_each_item(mock_session):
+    mock_session.scalars.return_value = [1]
+    mock_session.execute.return_value = [make_row(7, 'Dom Casmurro', 1899)]
+    prefix_index.build([], [])
+
+    response = await create_books(
+        [
+            BookRequest(year=1899, title='Dom Casmurro', novelist_id=1),
+            BookRequest(year=1881, title='Memórias Póstumas', novelist_id=1),
+            BookRequest(year=1943, title='Perto do Coração', novelist_id=9),
+            BookRequest(year=1900, title='Dom Casmurro', novelist_id=1),
+        ],
+        mock_session,
+    )
+
+    statement, params = mock_session.execute.call_args[0]
+    query = str(statement.compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (title) DO NOTHING RETURNING books.id' in query
+    assert [book['title'] for book in params] == [
+        'Dom Casmurro',
+        'Memórias Póstumas',
+    ]
+    assert [item.status for item in response.items] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.CONFLICT,
+    ]
+    assert response.items[1].detail == (
+        'title: Memórias Póstumas is already in use'
+    )
+    assert response.items[2].detail == 'novelist not found'
+    assert prefix_index.search('dom', limit=1) == [('book', 7, 'Dom Casmurro')]
+
+
+@pytest.mark.asyncio
+async def test_create_books_skips_insert_without_known_novelists(
+    mock_session,
+):
+    mock_session.scalars.return_value = []
+
+    response = await create_books(
+        [BookRequest(year=1899, title='Dom Casmurro', novelist_id=9)],
+        mock_session,
+    )
+
+    assert response.failed == 1
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_not_awaited()
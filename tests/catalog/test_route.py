@@ -0,0 +1,146 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import select
+
+from books_collection.book.models import Book
+from books_collection.novelist.models import Novelist
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_ndjson(client, session, token):
+    session.add(Novelist(name='Machado de Assis'))
+    await session.commit()
+
+    body = (
+        '{"novelist": "Machado de Assis", "title": "Dom Casmurro", '
+        '"year": 1899}\n'
+        '{"novelist": "Clarice Lispector", "title": "A Hora da Estrela", '
+        '"year": 1977}\n'
+        '{"novelist": "Clarice Lispector", "title": "A Hora da Estrela", '
+        '"year": 1977}\n'
+        '{"title": "Sem autor"}\n'
+    )
+
+    response = client.post(
+        '/catalog/import',
+        content=body.encode(),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'rows': 4,
+        'novelists_created': 1,
+        'books_created': 2,
+        'error_count': 2,
+        'errors': [
+            {'line': 3, 'error': 'title is duplicated in this upload'},
+            {'line': 4, 'error': 'novelist: Field required'},
+        ],
+    }
+
+    titles = await session.scalars(select(Book.title).order_by(Book.title))
+    assert titles.all() == ['A Hora da Estrela', 'Dom Casmurro']
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_csv_with_existing_title(client, session, token):
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.flush()
+    session.add(Book(year=1899, title='Dom Casmurro', novelist_id=novelist.id))
+    await session.commit()
+
+    response = client.post(
+        '/catalog/import',
+        params={'format': 'csv'},
+        content=(
+            b'novelist,title,year\n'
+            b'Machado de Assis,Dom Casmurro,1899\n'
+            b'Machado de Assis,Quincas Borba,1891\n'
+        ),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['books_created'] == 1
+    assert response.json()['errors'] == [
+        {'line': 2, 'error': 'title is already in use'}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_with_year_out_of_range(client, session, token):
+    response = client.post(
+        '/catalog/import',
+        content=(
+            b'{"novelist": "Homer", "title": "Odyssey", "year": -700}\n'
+            b'{"novelist": "Homer", "title": "Iliad!", "year": 99999999999}\n'
+            b'{"novelist": "Homer", "title": "Iliad!", "year": 1900}\n'
+        ),
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['books_created'] == 1
+    assert response.json()['errors'] == [
+        {
+            'line': 1,
+            'error': 'year: Input should be greater than or equal to 1000',
+        },
+        {
+            'line': 2,
+            'error': 'year: Input should be less than or equal to 9999',
+        },
+    ]
+
+    titles = await session.scalars(select(Book.title))
+    assert titles.all() == ['Iliad!']
+
+
+def test_import_catalog_without_login(client):
+    response = client.post('/catalog/import', content=b'')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_export_catalog_and_resume(client, session, token):
+    machado = Novelist(name='Machado de Assis')
+    clarice = Novelist(name='Clarice Lispector')
+    session.add_all([machado, clarice])
+    await session.flush()
+    session.add(Book(year=1899, title='Dom Casmurro', novelist_id=machado.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/catalog/export', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    first, second = [json.loads(line) for line in response.iter_lines()]
+    assert first['name'] == 'Machado de Assis'
+    assert first['books'] == [
+        {'id': first['books'][0]['id'], 'title': 'Dom Casmurro', 'year': 1899}
+    ]
+    assert second['name'] == 'Clarice Lispector'
+
+    resumed = client.get(
+        '/catalog/export',
+        params={'after': first['cursor'], 'format': 'csv'},
+        headers=headers,
+    )
+
+    assert resumed.text == f'Clarice Lispector,,,{second["cursor"]}\n'
+
+
+def test_export_catalog_with_invalid_cursor(client, token):
+    response = client.get(
+        '/catalog/export',
+        params={'after': 'invalid'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
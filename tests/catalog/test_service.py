@@ -0,0 +1,188 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from books_collection.catalog.schemas import CatalogRow, FilterExport
+from books_collection.catalog.service import (
+    chunked,
+    csv_lines,
+    export_catalog,
+    iter_lines,
+    ndjson_lines,
+    parse_csv,
+    parse_ndjson,
+)
+from books_collection.common.exception.errors import (
+    InvalidCursor,
+    InvalidUpload,
+)
+from books_collection.common.pagination import decode_cursor, encode_cursor
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunks():
+    lines = await collect(
+        iter_lines(stream(b'first\r\nsec', b'ond\n\xc3', b'\xa9 third'))
+    )
+
+    assert lines == ['first', 'second', 'é third']
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_with_invalid_encoding():
+    with pytest.raises(InvalidUpload, match='utf-8'):
+        await collect(iter_lines(stream(b'\xff\xfe')))
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_reports_invalid_rows():
+    records = await collect(
+        parse_ndjson(
+            iter_lines(
+                stream(
+                    b'{"novelist": "Machado de Assis"}\n'
+                    b'\n'
+                    b'{"novelist": "Machado de Assis", '
+                    b'"title": "Dom Casmurro"}\n'
+                    b'not json\n'
+                    b'{"novelist": "Machado de Assis", '
+                    b'"title": "Dom Casmurro", "year": 1899}\n'
+                )
+            )
+        )
+    )
+
+    expected_lines = [1, 3, 4, 5]
+    assert [line for line, _ in records] == expected_lines
+    assert records[0][1] == CatalogRow(novelist='Machado de Assis')
+    assert 'title and year must be informed together' in records[1][1]
+    assert 'Invalid JSON' in records[2][1]
+    assert records[3][1] == CatalogRow(
+        novelist='Machado de Assis', title='Dom Casmurro', year=1899
+    )
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_reports_year_out_of_range():
+    records = await collect(
+        parse_ndjson(
+            iter_lines(
+                stream(
+                    b'{"novelist": "Homer", "title": "Odyssey", '
+                    b'"year": -700}\n'
+                    b'{"novelist": "Homer", "title": "Iliad!", '
+                    b'"year": 99999999999}\n'
+                )
+            )
+        )
+    )
+
+    assert records == [
+        (1, 'year: Input should be greater than or equal to 1000'),
+        (2, 'year: Input should be less than or equal to 9999'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_with_quoted_newline():
+    records = await collect(
+        parse_csv(
+            iter_lines(
+                stream(
+                    b'novelist,title,year\n'
+                    b'Machado de Assis,,\n'
+                    b'"Assis, Machado","Dom\nCasmurro",1899\n'
+                    b'Clarice Lispector,A Hora da Estrela,abc\n'
+                )
+            )
+        )
+    )
+
+    expected_lines = [2, 3, 5]
+    assert [line for line, _ in records] == expected_lines
+    assert records[0][1] == CatalogRow(novelist='Machado de Assis')
+    assert records[1][1] == CatalogRow(
+        novelist='Assis, Machado', title='Dom\nCasmurro', year=1899
+    )
+    assert records[2][1].startswith('year:')
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_without_novelist_column():
+    with pytest.raises(InvalidUpload, match='novelist column'):
+        await collect(parse_csv(iter_lines(stream(b'name,title\n'))))
+
+
+async def novelists_stream():
+    yield SimpleNamespace(
+        id=1,
+        name='Machado de Assis',
+        books=[
+            SimpleNamespace(id=3, title='Quincas Borba', year=1891),
+            SimpleNamespace(id=2, title='Dom Casmurro', year=1899),
+        ],
+    )
+    yield SimpleNamespace(id=4, name='Clarice Lispector', books=[])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines_with_resume_cursor():
+    lines = await collect(ndjson_lines(novelists_stream()))
+
+    records = [json.loads(line) for line in lines]
+    assert [book['title'] for book in records[0]['books']] == [
+        'Dom Casmurro',
+        'Quincas Borba',
+    ]
+    assert records[1]['books'] == []
+    assert decode_cursor(records[1]['cursor']) == [4]
+
+
+@pytest.mark.asyncio
+async def test_csv_lines_can_be_imported_back():
+    exported = ''.join(await collect(csv_lines(novelists_stream())))
+
+    records = await collect(parse_csv(iter_lines(stream(exported.encode()))))
+
+    assert [row for _, row in records] == [
+        CatalogRow(
+            novelist='Machado de Assis', title='Dom Casmurro', year=1899
+        ),
+        CatalogRow(
+            novelist='Machado de Assis', title='Quincas Borba', year=1891
+        ),
+        CatalogRow(novelist='Clarice Lispector'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_lines_without_header():
+    lines = await collect(csv_lines(novelists_stream(), header=False))
+
+    assert not lines[0].startswith('novelist')
+
+
+@pytest.mark.asyncio
+async def test_chunked_groups_small_lines():
+    async def lines():
+        for number in range(5):
+            yield f'{number}\n'
+
+    chunks = await collect(chunked(lines(), size=4))
+
+    assert chunks == ['0\n1\n', '2\n3\n', '4\n']
+
+
+def test_export_catalog_rejects_cursor_of_another_ordering():
+    with pytest.raises(InvalidCursor):
+        export_catalog(FilterExport(after=encode_cursor(0.5, 1)))
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from books_collection.common.batch import Batch, BatchReport, first_by_key
+from books_collection.novelist.schemas import NovelistRequest, NovelistResponse
+from books_collection.settings import settings
+
+
+def test_batch_size_is_limited():
+    adapter = TypeAdapter(Batch[NovelistRequest])
+
+    with pytest.raises(ValidationError, match='at least 1 item'):
+        adapter.validate_python([])
+
+    with pytest.raises(ValidationError, match='at most'):
+        adapter.validate_python(
+            [{'name': 'Machado'}] * (settings.BATCH_MAX_SIZE + 1)
+        )
+
+
+def test_first_by_key_rejects_repeated_keys():
+    items = [
+        SimpleNamespace(username='machado', email='m@a.com'),
+        SimpleNamespace(username='machado', email='outro@a.com'),
+        SimpleNamespace(username='clarice', email='m@a.com'),
+        SimpleNamespace(username='clarice', email='c@l.com'),
+    ]
+    report = BatchReport(NovelistResponse, len(items))
+
+    pending = first_by_key(report, items, 'username', 'email')
+    report.created(0, NovelistResponse(id=1, name='machado'))
+    report.created(3, NovelistResponse(id=2, name='clarice'))
+    result = report.result()
+
+    assert list(pending) == [0, 3]
+    assert [item.status for item in result.items] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CREATED,
+    ]
+    assert result.items[1].detail == (
+        'username: machado is repeated in this batch'
+    )
+    assert result.items[2].detail == 'email: m@a.com is repeated in this batch'
+    assert result.created == result.failed == len(items) // 2
@@ -0,0 +1,71 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from books_collection.common.conditional import (
+    Conditional,
+    etag_matches,
+    weak_etag,
+)
+from books_collection.common.exception.errors import NotModified
+
+
+def make_row(id: int, updated_at: datetime):
+    return SimpleNamespace(id=id, updated_at=updated_at)
+
+
+ROWS = [
+    make_row(1, datetime(2026, 1, 1, 10)),
+    make_row(2, datetime(2026, 1, 2, 10)),
+]
+
+
+def make_conditional(if_none_match: str | None = None) -> Conditional:
+    response = MagicMock()
+    response.headers = {}
+    return Conditional(if_none_match, response)
+
+
+def test_weak_etag_changes_with_the_watermark():
+    etag = weak_etag(ROWS, None)
+
+    assert etag.startswith('W/"')
+    assert etag == weak_etag(list(ROWS), None)
+    assert etag != weak_etag(ROWS[:1], None)
+    assert etag != weak_etag(ROWS, 'next-cursor')
+    assert etag != weak_etag(
+        [ROWS[0], make_row(2, datetime(2026, 1, 3, 10))], None
+    )
+
+
+@pytest.mark.parametrize(
+    'if_none_match',
+    ['W/"abc"', '"abc"', '"other", W/"abc"', '*'],
+)
+def test_etag_matches(if_none_match):
+    assert etag_matches(if_none_match, 'W/"abc"')
+
+
+@pytest.mark.parametrize('if_none_match', [None, '', '"other"'])
+def test_etag_does_not_match(if_none_match):
+    assert not etag_matches(if_none_match, 'W/"abc"')
+
+
+def test_conditional_sets_etag_header():
+    conditional = make_conditional()
+
+    conditional.validate(ROWS)
+
+    assert conditional.etag == weak_etag(ROWS)
+    assert conditional.response.headers['ETag'] == weak_etag(ROWS)
+
+
+def test_conditional_raises_not_modified():
+    conditional = make_conditional(weak_etag(ROWS))
+
+    with pytest.raises(NotModified) as error:
+        conditional.validate(ROWS)
+
+    assert error.value.etag == weak_etag(ROWS)
@@ -0,0 +1,90 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import column, select, table
+from sqlalchemy.dialects import postgresql
+
+from books_collection.common.exception.errors import InvalidCursor
+from books_collection.common.filters import FilterPage
+from books_collection.common.pagination import (
+    cursor_values,
+    decode_cursor,
+    encode_cursor,
+    keyset,
+    split_page,
+)
+from books_collection.settings import settings
+
+items = table('items', column('id'))
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(42, 'name')
+
+    assert decode_cursor(cursor) == [42, 'name']
+
+
+@pytest.mark.parametrize('cursor', ['%%%', 'bm90LWpzb24', 'e30'])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match='invalid cursor'):
+        decode_cursor(cursor)
+
+
+def test_filter_page_rejects_invalid_cursor():
+    with pytest.raises(ValidationError):
+        FilterPage(after='invalid')
+
+
+def test_cursor_values_checks_types():
+    cursor = encode_cursor(0.5, 'book', 3)
+
+    assert cursor_values(cursor, float, str, int) == [0.5, 'book', 3]
+    assert cursor_values(encode_cursor(1, 3), float, int) == [1, 3]
+
+
+@pytest.mark.parametrize(
+    'values', [('abc',), ({},), ([1],), (True,), (1.5,), (1, 2)]
+)
+def test_cursor_values_rejects_malformed_values(values):
+    with pytest.raises(InvalidCursor):
+        cursor_values(encode_cursor(*values), int)
+
+
+def test_keyset_rejects_non_integer_cursor():
+    page = FilterPage(after=encode_cursor('abc'))
+
+    with pytest.raises(InvalidCursor):
+        keyset(select(items.c.id), page, items.c.id)
+
+
+def test_filter_page_rejects_limit_above_maximum():
+    with pytest.raises(ValidationError):
+        FilterPage(limit=settings.MAX_PAGE_SIZE + 1)
+
+
+def test_keyset_query():
+    page = FilterPage(after=encode_cursor(10), limit=5)
+    query = keyset(select(items.c.id), page, items.c.id)
+
+    compiled = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+    )
+
+    assert 'WHERE items.id > 10' in str(compiled)
+    assert 'ORDER BY items.id' in str(compiled)
+    assert 'LIMIT 6' in str(compiled)
+
+
+def test_split_page_with_next_page():
+    page = FilterPage(limit=2)
+
+    rows, cursor = split_page([1, 2, 3], page, lambda row: (row,))
+
+    assert rows == [1, 2]
+    assert decode_cursor(cursor) == [2]
+
+
+def test_split_page_last_page():
+    rows, cursor = split_page([1, 2], FilterPage(limit=2), lambda row: (row,))
+
+    assert rows == [1, 2]
+    assert cursor is None
@@ -0,0 +1,63 @@
+import pytest
+
+from books_collection.common.rate_limit import (
+    MemoryBucketBackend,
+    SharedMemoryBucketBackend,
+    TokenBucketLimiter,
+    retry_after_header,
+)
+
+
+@pytest.fixture
+def shared_backend(tmp_path):
+    backend = SharedMemoryBucketBackend(str(tmp_path / 'buckets'), 16)
+    yield backend
+    backend.close()
+
+
+@pytest.mark.parametrize('backend_name', ['memory', 'shared'])
+def test_token_bucket_rejects_after_capacity(
+    backend_name, shared_backend, clock
+):
+    backend = (
+        MemoryBucketBackend(16) if backend_name == 'memory' else shared_backend
+    )
+    limiter = TokenBucketLimiter(backend, 3, 0.5, clock=clock)
+
+    assert [limiter.acquire('login:1.1.1.1') for _ in range(3)] == [0, 0, 0]
+
+    retry_after = limiter.acquire('login:1.1.1.1')
+    assert retry_after == pytest.approx(2.0)
+    assert limiter.acquire('login:2.2.2.2') == 0
+
+    clock.now += 2
+    assert limiter.acquire('login:1.1.1.1') == 0
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_shared_memory_backend_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / 'buckets')
+    first = TokenBucketLimiter(
+        SharedMemoryBucketBackend(path, 16), 1, 1, clock=clock
+    )
+    second = TokenBucketLimiter(
+        SharedMemoryBucketBackend(path, 16), 1, 1, clock=clock
+    )
+
+    assert first.acquire('register:1.1.1.1') == 0
+    assert second.acquire('register:1.1.1.1') > 0
+
+
+def test_memory_backend_discards_oldest_keys(clock):
+    backend = MemoryBucketBackend(2)
+    limiter = TokenBucketLimiter(backend, 1, 0.1, clock=clock)
+    limiter.acquire('a')
+    limiter.acquire('b')
+    limiter.acquire('c')
+
+    assert limiter.acquire('a') == 0
+
+
+def test_retry_after_header_rounds_up():
+    assert retry_after_header(0.2) == 1
+    assert retry_after_header(2.1) == 3  # noqa: PLR2004
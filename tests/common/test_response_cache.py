@@ -0,0 +1,339 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from threading import Thread
+from time import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Request
+from pydantic import BaseModel
+
+from books_collection.common import response_cache as module
+from books_collection.common.conditional import Conditional
+from books_collection.common.exception.errors import NotModified
+from books_collection.common.response_cache import (
+    CachedRead,
+    CacheEntry,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+)
+from books_collection.database.config import READ_YOUR_WRITES_COOKIE
+
+
+class Page(BaseModel):
+    names: list[str]
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+        self.names = ['Machado de Assis']
+
+    async def __call__(self, session, conditional):
+        self.calls += 1
+        rows = [SimpleNamespace(id=1, updated_at=datetime(2026, 1, 1))]
+        conditional.validate(rows, self.names)
+        return Page(names=list(self.names))
+
+
+def make_entry(body: bytes = b'{}', generation: int = 0) -> CacheEntry:
+    return CacheEntry(generation, 1000.0, 0.5, 'W/"abc"', body)
+
+
+@pytest.fixture
+def sessions(mock_session, monkeypatch):
+    opened = []
+
+    @asynccontextmanager
+    async def read_session(primary=False):
+        opened.append(primary)
+        yield mock_session
+
+    monkeypatch.setattr(module, 'read_session', read_session)
+    return opened
+
+
+@pytest.fixture
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryCacheBackend(2)
+    return FileCacheBackend(str(tmp_path / 'cache'), 2)
+
+
+def test_entry_pack_round_trip():
+    entry = make_entry(b'{"names":[]}', generation=7)
+
+    assert CacheEntry.unpack(entry.pack()) == entry
+
+
+@pytest.mark.parametrize('backend', ['memory', 'file'], indirect=True)
+def test_backend_stores_entries_and_generations(backend):
+    expected_generation, expected_bumped_at = 2, 1234.5
+    backend.set('novelists:a', make_entry(b'a'))
+
+    assert backend.get('novelists:a').body == b'a'
+    assert backend.get('novelists:b') is None
+
+    backend.bump('novelists')
+    backend.bump('novelists', at=expected_bumped_at)
+    assert backend.generation('novelists') == expected_generation
+    assert backend.bumped_at('novelists') == expected_bumped_at
+    assert backend.generation('books') == 0
+    assert backend.bumped_at('books') == 0
+
+    backend.clear()
+    assert backend.get('novelists:a') is None
+    assert backend.generation('novelists') == 0
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(2)
+    backend.set('a', make_entry(b'a'))
+    backend.set('b', make_entry(b'b'))
+    backend.get('a')
+    backend.set('c', make_entry(b'c'))
+
+    assert backend.get('b') is None
+    assert backend.get('a').body == b'a'
+    assert backend.get('c').body == b'c'
+
+
+def test_file_backend_prunes_oldest_entries(tmp_path):
+    backend = FileCacheBackend(str(tmp_path / 'cache'), 2)
+    backend.prune_every = 3
+    for key in ('a', 'b', 'c'):
+        backend.set(key, make_entry(key.encode()))
+
+    entries = list((tmp_path / 'cache').glob('*.entry'))
+    assert len(entries) == backend.max_entries
+
+
+def test_file_backend_is_shared_between_instances(tmp_path):
+    writer = FileCacheBackend(str(tmp_path / 'cache'), 8)
+    reader = FileCacheBackend(str(tmp_path / 'cache'), 8)
+
+    writer.set('books:a', make_entry(b'a'))
+    writer.bump('books')
+
+    assert reader.get('books:a').body == b'a'
+    assert reader.generation('books') == 1
+
+
+def test_file_backend_generation_never_reads_back_zero(tmp_path):
+    backend = FileCacheBackend(str(tmp_path / 'cache'), 8)
+    backend.bump('books')
+    bumps = 200
+
+    writer = Thread(
+        target=lambda: [backend.bump('books') for _ in range(bumps)]
+    )
+    writer.start()
+    seen = []
+    while writer.is_alive():
+        seen.append(backend.generation('books'))
+    writer.join()
+
+    assert min(seen, default=1) >= 1
+    assert seen == sorted(seen)
+    assert backend.generation('books') == bumps + 1
+
+
+@pytest.mark.asyncio
+async def test_serve_misses_then_hits(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30)
+    load = Loader()
+
+    first = await cache.serve('novelists', 'a', load, Conditional())
+    second = await cache.serve('novelists', 'a', load, Conditional())
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.body == b'{"names":["Machado de Assis"]}'
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert load.calls == 1
+    assert sessions == [False]
+
+
+@pytest.mark.asyncio
+async def test_serve_answers_304_from_cached_etag(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30)
+    load = Loader()
+    response = await cache.serve('novelists', 'a', load, Conditional())
+
+    with pytest.raises(NotModified):
+        await cache.serve(
+            'novelists',
+            'a',
+            load,
+            Conditional(response.headers['ETag']),
+        )
+
+    assert load.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_with_matching_etag_still_populates_cache(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30)
+    load = Loader()
+    response = await cache.serve('novelists', 'a', load, Conditional())
+    etag = response.headers['ETag']
+
+    cache.invalidate('novelists')
+    for _ in range(5):
+        with pytest.raises(NotModified):
+            await cache.serve('novelists', 'a', load, Conditional(etag))
+
+    expected_calls, expected_hits = 2, 4
+    assert load.calls == expected_calls
+    assert cache.hits == expected_hits
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_reload(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30)
+    load = Loader()
+    await cache.serve('novelists', 'a', load, Conditional())
+
+    load.names = ['Clarice Lispector']
+    cache.invalidate('novelists')
+    response = await cache.serve('novelists', 'a', load, Conditional())
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.body == b'{"names":["Clarice Lispector"]}'
+
+
+@pytest.mark.asyncio
+async def test_fill_after_invalidate_reads_from_primary(sessions, clock):
+    cache = ResponseCache(
+        MemoryCacheBackend(8), ttl_secs=30, stale_secs=60, clock=clock
+    )
+    load = Loader()
+    await cache.serve('books', 'a', load, Conditional())
+
+    cache.invalidate('books')
+    await cache.serve('books', 'b', load, Conditional())
+    await cache.serve('books', 'a', load, Conditional())
+    await asyncio.gather(*cache._tasks)
+
+    clock.now += 6
+    await cache.serve('books', 'c', load, Conditional())
+
+    # réplica, primário no MISS e no refresh logo após o bump, réplica de novo
+    assert sessions == [False, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_reloaded(sessions, clock):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30, clock=clock)
+    load = Loader()
+    await cache.serve('books', 'a', load, Conditional())
+
+    clock.now += 31
+    response = await cache.serve('books', 'a', load, Conditional())
+
+    expected_calls = 2
+    assert response.headers['X-Cache'] == 'MISS'
+    assert load.calls == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing(sessions, clock):
+    cache = ResponseCache(
+        MemoryCacheBackend(8), ttl_secs=30, stale_secs=60, clock=clock
+    )
+    load = Loader()
+    await cache.serve('books', 'a', load, Conditional())
+
+    load.names = ['Clarice Lispector']
+    cache.invalidate('books')
+    stale = await cache.serve('books', 'a', load, Conditional())
+    again = await cache.serve('books', 'a', load, Conditional())
+    await asyncio.gather(*cache._tasks)
+    fresh = await cache.serve('books', 'a', load, Conditional())
+
+    assert stale.headers['X-Cache'] == 'STALE'
+    assert stale.body == b'{"names":["Machado de Assis"]}'
+    assert again.headers['X-Cache'] == 'STALE'
+    assert fresh.headers['X-Cache'] == 'HIT'
+    assert fresh.body == b'{"names":["Clarice Lispector"]}'
+    assert cache.refreshes == 1
+
+    clock.now += 91
+    expired = await cache.serve('books', 'a', load, Conditional())
+    assert expired.headers['X-Cache'] == 'MISS'
+
+
+@pytest.mark.asyncio
+async def test_writer_skips_stale_entry_of_older_generation(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30, stale_secs=60)
+    load = Loader()
+    await cache.serve('books', 'a', load, Conditional())
+
+    load.names = ['Clarice Lispector']
+    cache.invalidate('books')
+    response = await cache.serve(
+        'books', 'a', load, Conditional(), primary=True
+    )
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.body == b'{"names":["Clarice Lispector"]}'
+    assert cache.stale_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_logged_and_keeps_entry(sessions, caplog):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30, stale_secs=60)
+    load = Loader()
+    await cache.serve('books', 'a', load, Conditional())
+
+    async def broken(session, conditional):
+        raise OSError('connection refused')
+
+    cache.invalidate('books')
+    stale = await cache.serve('books', 'a', broken, Conditional())
+    await asyncio.gather(*cache._tasks)
+
+    assert stale.headers['X-Cache'] == 'STALE'
+    assert 'response cache refresh failed for books:a' in caplog.text
+    assert cache.refreshes == 0
+    assert not cache._refreshing
+
+
+@pytest.mark.asyncio
+async def test_stats_report_hit_ratio(sessions):
+    cache = ResponseCache(MemoryCacheBackend(8), ttl_secs=30)
+    load = Loader()
+    for _ in range(4):
+        await cache.serve('novelists', 'a', load, Conditional())
+
+    stats = cache.stats()
+
+    expected_hits = 3
+    assert stats['backend'] == 'MemoryCacheBackend'
+    assert stats['hits'] == expected_hits
+    assert stats['misses'] == 1
+    assert stats['hit_ratio'] == pytest.approx(0.75)
+    assert stats['saved_ms'] >= 0
+
+    cache.clear()
+    assert cache.stats()['hits'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_read_opens_primary_after_own_write(sessions):
+    cookie = f'{READ_YOUR_WRITES_COOKIE}={int(time()) + 60}'
+    request = Request({
+        'type': 'http',
+        'path': '/novelists/',
+        'query_string': b'',
+        'headers': [(b'cookie', cookie.encode())],
+    })
+    cache = CachedRead(request, Conditional())
+    load = Loader()
+
+    await cache.serve('novelists', load)
+    await cache.serve('novelists', load)
+
+    assert sessions == [True]
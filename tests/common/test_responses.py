@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import orjson
+
+from books_collection.account.enums import State
+from books_collection.account.models import Account
+from books_collection.account.schemas import AccountResponse
+from books_collection.book.models import Book
+from books_collection.book.schemas import BookResponse
+from books_collection.common.responses import (
+    ModelResponse,
+    encode,
+    to_response,
+)
+from books_collection.novelist.models import Novelist
+
+
+def test_encode_model_uses_aliases():
+    book = BookResponse(id=1, year=1899, title='Dom Casmurro', novelist_id=2)
+
+    assert orjson.loads(encode(book)) == {
+        'id': 1,
+        'year': 1899,
+        'title': 'Dom Casmurro',
+        'novelistId': 2,
+        'novelist': None,
+    }
+
+
+def test_encode_plain_content():
+    assert encode({'status': 'Up'}) == b'{"status":"Up"}'
+
+
+def test_model_response_keeps_status_and_headers():
+    book = BookResponse(id=1, year=1899, title='Dom Casmurro', novelist_id=2)
+
+    response = ModelResponse(
+        book, HTTPStatus.CREATED, headers={'ETag': 'W/"abc"'}
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['ETag'] == 'W/"abc"'
+    assert response.body == encode(book)
+
+
+def test_to_response_reads_declared_fields():
+    account = Account(username='machado', email='m@a.com', password='hash')
+    account.id = 1
+
+    response = to_response(AccountResponse, account)
+
+    assert response == AccountResponse(
+        id=1, username='machado', email='m@a.com', state=State.enabled
+    )
+
+
+def test_to_response_skips_unloaded_relationships():
+    book = Book(year=1899, title='Dom Casmurro', novelist_id=2)
+    book.id = 1
+
+    response = to_response(BookResponse, book)
+
+    assert response.novelist is None
+    assert response.novelist_id == book.novelist_id
+
+
+def test_to_response_converts_loaded_relationships():
+    novelist = Novelist(name='Machado de Assis')
+    novelist.id = 2
+    book = Book(year=1899, title='Dom Casmurro', novelist_id=2)
+    book.id = 1
+    book.novelist = novelist
+
+    response = to_response(BookResponse, book)
+
+    assert response.novelist.name == 'Machado de Assis'
@@ -3,26 +3,55 @@ from unittest.mock import AsyncMock
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from testcontainers.postgres import PostgresContainer
 
 from books_collection.account.models import Account
 from books_collection.app import app
-from books_collection.auth.security import hash_password
-from books_collection.database.config import get_session
+from books_collection.auth.hashing import hash_password
+from books_collection.auth.principal import principal_cache
+from books_collection.auth.revocation import revocation_list
+from books_collection.common.rate_limit import rate_limiter
+from books_collection.common.response_cache import response_cache
+from books_collection.database.config import (
+    get_read_session,
+    get_session,
+    replica_session_factory,
+    session_factory,
+)
 from books_collection.database.tables import table_registry
+from books_collection.search.autocomplete import prefix_index
 
 
 @pytest.fixture(scope='session')
 def engine():
     with PostgresContainer(image='postgres:16', driver='psycopg') as postgres:
         _engine = create_async_engine(postgres.get_connection_url())
+        session_factory.configure(bind=_engine)
+        replica_session_factory.configure(bind=_engine)
         yield _engine
 
 
+@pytest.fixture(autouse=True)
+def clear_in_memory_state():
+    principal_cache.clear()
+    rate_limiter.clear()
+    revocation_list.clear()
+    prefix_index.clear()
+    response_cache.clear()
+    yield
+    principal_cache.clear()
+    rate_limiter.clear()
+    revocation_list.clear()
+    prefix_index.clear()
+    response_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def session(engine):
     async with engine.begin() as conn:
+        await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
         await conn.run_sync(table_registry.metadata.create_all)
 
     async with AsyncSession(engine, expire_on_commit=False) as session:
@@ -58,6 +87,7 @@ def client(session):
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_read_session] = override_session
         yield client
         app.dependency_overrides.clear()
 
@@ -79,3 +109,29 @@ def token(client, account):
 @pytest.fixture
 def mock_session():
     return AsyncMock(spec=AsyncSession)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+# relógio controlado pelo teste para os caches e limitadores em memória
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine.sync_engine, 'before_cursor_execute', record)
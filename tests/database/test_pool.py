@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from books_collection.database.pool import PoolMetricsMixin
+
+
+class MeasuredQueuePool(PoolMetricsMixin, QueuePool):
+    pass
+
+
+def make_pool():
+    return MeasuredQueuePool(
+        lambda: sqlite3.connect(':memory:'),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.01,
+    )
+
+
+def test_pool_stats_counts_checkouts():
+    pool = make_pool()
+
+    connection = pool.connect()
+    stats = pool.stats()
+
+    assert stats['checked_out'] == 1
+    assert stats['checkouts'] == 1
+    assert stats['waiters'] == 0
+
+    connection.close()
+
+    assert pool.stats()['checked_out'] == 0
+    assert pool.stats()['checked_in'] == 1
+
+
+def test_pool_stats_counts_failed_checkouts():
+    pool = make_pool()
+    connection = pool.connect()
+
+    with pytest.raises(TimeoutError):
+        pool.connect()
+
+    stats = pool.stats()
+    connection.close()
+
+    assert stats['failed_checkouts'] == 1
+    assert stats['waiters'] == 0
@@ -0,0 +1,89 @@
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import Request, Response
+
+from books_collection.database import config
+from books_collection.database.config import (
+    READ_YOUR_WRITES_COOKIE,
+    get_read_session,
+    mark_write,
+    read_session,
+    wrote_recently,
+)
+
+
+def make_request(cookie: str | None = None) -> Request:
+    headers = []
+    if cookie is not None:
+        headers.append((
+            b'cookie',
+            f'{READ_YOUR_WRITES_COOKIE}={cookie}'.encode(),
+        ))
+    return Request({'type': 'http', 'headers': headers})
+
+
+def test_wrote_recently():
+    assert wrote_recently(make_request(str(int(time()) + 5)))
+    assert not wrote_recently(make_request(str(int(time()) - 1)))
+    assert not wrote_recently(make_request('invalid'))
+    assert not wrote_recently(make_request())
+
+
+def test_mark_write_sets_cookie():
+    response = Response()
+    mark_write(response)
+
+    assert READ_YOUR_WRITES_COOKIE in response.headers['set-cookie']
+
+
+def make_factory():
+    session = MagicMock()
+
+    async def connection(**kwargs):
+        session.connection_kwargs = kwargs
+
+    session.connection = connection
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    return factory, session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('cookie', 'expected'),
+    [(None, 'replica'), (str(int(time()) + 60), 'primary')],
+)
+async def test_get_read_session_routing(cookie, expected):
+    primary, primary_session = make_factory()
+    replica, replica_session = make_factory()
+
+    with (
+        patch.object(config, 'replica_engine', MagicMock()),
+        patch.object(config, 'session_factory', primary),
+        patch.object(config, 'replica_session_factory', replica),
+    ):
+        session = await anext(get_read_session(make_request(cookie)))
+
+    expected_session = (
+        replica_session if expected == 'replica' else primary_session
+    )
+    assert session is expected_session
+    assert session.connection_kwargs == {
+        'execution_options': {'postgresql_readonly': True}
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_session_falls_back_to_primary_without_replica():
+    primary, primary_session = make_factory()
+    replica, _ = make_factory()
+
+    with (
+        patch.object(config, 'replica_engine', None),
+        patch.object(config, 'session_factory', primary),
+        patch.object(config, 'replica_session_factory', replica),
+    ):
+        async with read_session() as session:
+            assert session is primary_session
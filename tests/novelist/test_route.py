@@ -1,2 +1,268 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select
+
+from books_collection.book.models import Book
+from books_collection.common.pagination import encode_cursor
+from books_collection.novelist.models import Novelist
+
+
 def test_create_novelist():
     assert True
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name(client, session, token):
+    session.add_all([
+        Novelist(name='Machado de Assis'),
+        Novelist(name='Clarice Lispector'),
+        Novelist(name='Assis Brasil'),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/novelists',
+        params={'name': 'ASSIS'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    names = [novelist['name'] for novelist in response.json()['novelists']]
+
+    assert response.status_code == HTTPStatus.OK
+    assert sorted(names) == ['Assis Brasil', 'Machado de Assis']
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name_escapes_wildcards(
+    client, session, token
+):
+    session.add_all([Novelist(name='100% Romance'), Novelist(name='1000')])
+    await session.commit()
+
+    response = client.get(
+        '/novelists',
+        params={'name': '0%'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    names = [novelist['name'] for novelist in response.json()['novelists']]
+
+    assert names == ['100% Romance']
+
+
+@pytest.mark.parametrize(
+    'params',
+    [
+        {'after': encode_cursor('abc')},
+        {'after': encode_cursor({})},
+        {'name': 'assis', 'after': encode_cursor('abc', 1)},
+    ],
+)
+def test_list_novelists_with_malformed_cursor(client, token, params):
+    response = client.get(
+        '/novelists',
+        params=params,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'cursor does not match the requested ordering'
+    }
+
+
+async def add_prolific_novelist(session) -> Novelist:
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.flush()
+    session.add_all([
+        Book(year=1900, title=f'Livro {number:03}', novelist_id=novelist.id)
+        for number in range(50)
+    ])
+    await session.commit()
+    return novelist
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_statement_count(
+    client, session, token, statements
+):
+    await add_prolific_novelist(session)
+    statements.clear()
+
+    response = client.get(
+        '/novelists', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(statements) == 1
+    assert 'books' not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_update_novelist_statement_count(
+    client, session, token, statements
+):
+    novelist = await add_prolific_novelist(session)
+    statements.clear()
+
+    response = client.patch(
+        f'/novelists/{novelist.id}',
+        json={'name': 'Joaquim Maria Machado de Assis'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': novelist.id,
+        'name': 'Joaquim Maria Machado de Assis',
+    }
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE novelists SET')
+    assert 'RETURNING' in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_delete_novelist_with_books(client, session, token, statements):
+    novelist = await add_prolific_novelist(session)
+    statements.clear()
+
+    response = client.delete(
+        f'/novelists/{novelist.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    assert len(statements) == 1
+    assert statements[0].startswith('DELETE FROM novelists')
+    assert await session.scalar(select(func.count()).select_from(Book)) == 0
+
+
+def test_delete_novelist_not_found(client, token):
+    response = client.delete(
+        '/novelists/99', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'novelist not found'}
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_not_modified(client, session, token):
+    session.add(Novelist(name='Machado de Assis'))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get('/novelists', headers=headers)
+    second = client.get(
+        '/novelists',
+        headers={**headers, 'If-None-Match': first.headers['ETag']},
+    )
+
+    assert first.status_code == HTTPStatus.OK
+    assert first.headers['ETag'].startswith('W/')
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert not second.content
+
+
+@pytest.mark.asyncio
+async def test_get_novelist_etag_changes_after_update(client, session, token):
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get(f'/novelists/{novelist.id}', headers=headers)
+    client.patch(
+        f'/novelists/{novelist.id}',
+        json={'name': 'Joaquim Maria Machado de Assis'},
+        headers=headers,
+    )
+    second = client.get(
+        f'/novelists/{novelist.id}',
+        headers={**headers, 'If-None-Match': first.headers['ETag']},
+    )
+
+    assert first.json() == {'id': novelist.id, 'name': 'Machado de Assis'}
+    assert second.status_code == HTTPStatus.OK
+    assert second.json()['name'] == 'Joaquim Maria Machado de Assis'
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
+def test_get_novelist_not_found(client, token):
+    response = client.get(
+        '/novelists/99', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_novelists_is_cached_until_a_write(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get('/novelists', headers=headers)
+    second = client.get('/novelists', headers=headers)
+    client.post('/novelists', json={'name': 'Machado'}, headers=headers)
+    third = client.get('/novelists', headers=headers)
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.json() == first.json()
+    assert third.headers['X-Cache'] == 'MISS'
+    assert [novelist['name'] for novelist in third.json()['novelists']] == [
+        'Machado'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_novelist_with_name_in_use(
+    client, session, token, statements
+):
+    session.add(Novelist(name='Machado de Assis'))
+    await session.commit()
+    statements.clear()
+
+    response = client.post(
+        '/novelists',
+        json={'name': 'Machado de Assis'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    inserts = [sql for sql in statements if sql.startswith('INSERT')]
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {
+        'detail': 'name: Machado de Assis is already in use'
+    }
+    assert len(inserts) == 1
+    assert 'ON CONFLICT (name) DO NOTHING' in inserts[0]
+
+
+@pytest.mark.asyncio
+async def test_create_novelists_batch(client, session, token, statements):
+    session.add(Novelist(name='Machado de Assis'))
+    await session.commit()
+    statements.clear()
+
+    response = client.post(
+        '/novelists/batch',
+        json=[
+            {'name': 'Machado de Assis'},
+            {'name': 'Clarice Lispector'},
+            {'name': 'Rachel de Queiroz'},
+        ],
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    inserts = [sql for sql in statements if sql.startswith('INSERT')]
+    assert response.status_code == HTTPStatus.OK
+    assert [item['status'] for item in response.json()['items']] == [
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CREATED,
+        HTTPStatus.CREATED,
+    ]
+    expected_novelists = 3
+    assert len(inserts) == 1
+    assert (
+        await session.scalar(select(func.count()).select_from(Novelist))
+        == expected_novelists
+    )
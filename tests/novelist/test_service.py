@@ -0,0 +1,275 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from books_collection.common.exception.errors import (
+    DuplicatedRegistry,
+    InvalidCursor,
+    RegistryNotFound,
+)
+from books_collection.common.pagination import decode_cursor, encode_cursor
+from books_collection.novelist.benchmark import (
+    asdict_response,
+    build_novelist,
+    run_candidate,
+    schema_response,
+)
+from books_collection.novelist.schemas import (
+    FilterNovelist,
+    NovelistRequest,
+    NovelistUpdate,
+)
+from books_collection.novelist.service import (
+    create_novelist,
+    create_novelists,
+    delete_novelist,
+    list_novelists,
+    update_novelist,
+)
+from books_collection.search.autocomplete import prefix_index
+
+
+def make_row(id: int, name: str, score: float | None = None):
+    return SimpleNamespace(id=id, name=name, score=score)
+
+
+def compiled_query(mock_call) -> str:
+    statement = mock_call.call_args[0][0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name_ordered_by_similarity(mock_session):
+    rows = [
+        make_row(2, 'Machado de Assis', 0.5),
+        make_row(1, 'Assis Brasil', 0.4),
+        make_row(3, 'Joaquim Assis', 0.4),
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_session.execute.return_value = mock_result
+
+    response = await list_novelists(
+        FilterNovelist(name='assis', limit=2), mock_session
+    )
+
+    query = compiled_query(mock_session.execute)
+    assert 'novelists.name ILIKE' in query
+    assert 'ORDER BY similarity(novelists.name' in query
+    assert [novelist.id for novelist in response.novelists] == [2, 1]
+    assert decode_cursor(response.next_cursor) == [0.4, 1]
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name_with_cursor(mock_session):
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    await list_novelists(
+        FilterNovelist(name='assis', after=encode_cursor(0.4, 1)),
+        mock_session,
+    )
+
+    query = compiled_query(mock_session.execute)
+    assert 'WHERE novelists.name ILIKE' in query
+    assert 'novelists.id > ' in query
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name_with_mismatched_cursor(mock_session):
+    with pytest.raises(InvalidCursor):
+        await list_novelists(
+            FilterNovelist(name='assis', after=encode_cursor(1)),
+            mock_session,
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_by_name_with_malformed_cursor(mock_session):
+    with pytest.raises(InvalidCursor):
+        await list_novelists(
+            FilterNovelist(name='assis', after=encode_cursor('0.5', 1)),
+            mock_session,
+        )
+
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_novelists_selects_only_columns(mock_session):
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        make_row(1, 'Machado de Assis'),
+        make_row(2, 'Clarice Lispector'),
+    ]
+    mock_session.execute.return_value = mock_result
+
+    response = await list_novelists(FilterNovelist(limit=1), mock_session)
+
+    query = compiled_query(mock_session.execute)
+    assert query.startswith(
+        'SELECT novelists.id, novelists.name, novelists.updated_at \nFROM'
+    )
+    assert 'books' not in query
+    assert [novelist.name for novelist in response.novelists] == [
+        'Machado de Assis'
+    ]
+    assert decode_cursor(response.next_cursor) == [1]
+
+
+@pytest.mark.asyncio
+async def test_update_novelist_in_one_statement(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = make_row(1, 'Machado de Assis')
+    mock_session.execute.return_value = mock_result
+
+    response = await update_novelist(
+        1, NovelistUpdate(name='Machado de Assis'), mock_session
+    )
+
+    query = compiled_query(mock_session.execute)
+    assert query.startswith('UPDATE novelists SET name=')
+    assert 'RETURNING novelists.id, novelists.name' in query
+    assert response.name == 'Machado de Assis'
+    mock_session.commit.assert_awaited_once()
+    mock_session.scalar.assert_not_called()
+    mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_novelist_not_found(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    with pytest.raises(RegistryNotFound, match='novelist not found'):
+        await update_novelist(1, NovelistUpdate(name='Machado'), mock_session)
+
+
+@pytest.mark.asyncio
+async def test_update_novelist_with_name_in_use(mock_session):
+    orig = SimpleNamespace(
+        diag=SimpleNamespace(constraint_name='novelists_name_key')
+    )
+    mock_session.execute.side_effect = IntegrityError('statement', {}, orig)
+
+    with pytest.raises(
+        DuplicatedRegistry, match='name: Machado is already in use'
+    ):
+        await update_novelist(1, NovelistUpdate(name='Machado'), mock_session)
+
+    mock_session.rollback.assert_awaited_once()
+
+
+def test_response_benchmark_paths_agree():
+    novelist = build_novelist(books=50)
+
+    assert asdict_response(novelist) == schema_response(novelist)
+    assert run_candidate(novelist, schema_response, 2)['peak_kib'] > 0
+
+
+@pytest.mark.asyncio
+async def test_create_novelist_in_one_statement(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = make_row(1, 'Machado de Assis')
+    mock_session.execute.return_value = mock_result
+    prefix_index.build([], [])
+
+    response = await create_novelist(
+        NovelistRequest(name='Machado de Assis'), mock_session
+    )
+
+    query = compiled_query(mock_session.execute)
+    assert query.startswith('INSERT INTO novelists (name)')
+    assert 'ON CONFLICT (name) DO NOTHING RETURNING novelists.id' in query
+    assert response.id == 1
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
+    assert prefix_index.search('mach', 10) == [
+        ('novelist', 1, 'Machado de Assis')
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_novelist_with_name_in_use(mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    with pytest.raises(
+        DuplicatedRegistry, match='name: Machado de Assis is already in use'
+    ):
+        await create_novelist(
+            NovelistRequest(name='Machado de Assis'), mock_session
+        )
+
+    mock_session.commit.assert_not_awaited()
+    mock_session.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_novelist_in_one_statement(mock_session):
+    mock_session.scalar.return_value = 1
+    prefix_index.build([(1, 'Machado de Assis')], [])
+
+    await delete_novelist(1, mock_session)
+
+    query = compiled_query(mock_session.scalar)
+    assert query.startswith('DELETE FROM novelists WHERE novelists.id = ')
+    assert query.endswith('RETURNING novelists.id')
+    mock_session.delete.assert_not_called()
+    mock_session.commit.assert_awaited_once()
+    assert prefix_index.search('mach', 10) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_novelist_not_found(mock_session):
+    mock_session.scalar.return_value = None
+
+    with pytest.raises(RegistryNotFound, match='novelist not found'):
+        await delete_novelist(1, mock_session)
+
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_novelists_reports_each_item(mock_session):
+    mock_session.execute.return_value = [make_row(1, 'Machado de Assis')]
+    prefix_index.build([], [])
+
+    response = await create_novelists(
+        [
+            NovelistRequest(name='Machado de Assis'),
+            NovelistRequest(name='Machado de Assis'),
+            NovelistRequest(name='Clarice Lispector'),
+        ],
+        mock_session,
+    )
+
+    statement, params = mock_session.execute.call_args[0]
+    query = str(statement.compile(dialect=postgresql.dialect()))
+    assert 'ON CONFLICT (name) DO NOTHING RETURNING novelists.id' in query
+    assert params == [
+        {'name': 'Machado de Assis'},
+        {'name': 'Clarice Lispector'},
+    ]
+    mock_session.commit.assert_awaited_once()
+
+    assert [item.status for item in response.items] == [
+        HTTPStatus.CREATED,
+        HTTPStatus.CONFLICT,
+        HTTPStatus.CONFLICT,
+    ]
+    assert response.items[0].item.id == 1
+    assert response.items[2].detail == (
+        'name: Clarice Lispector is already in use'
+    )
+    assert response.created == 1
+    assert prefix_index.search('mach', 10) == [
+        ('novelist', 1, 'Machado de Assis')
+    ]
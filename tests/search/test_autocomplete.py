@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from books_collection.search import autocomplete as module
+from books_collection.search.autocomplete import PrefixIndex
+
+
+def build_index():
+    index = PrefixIndex()
+    index.build(
+        novelists=[(1, 'Machado de Assis'), (2, 'Clarice Lispector')],
+        books=[
+            (1, 'Dom Casmurro', 1),
+            (2, 'Memórias Póstumas', 1),
+            (3, 'A Hora da Estrela', 2),
+        ],
+    )
+    return index
+
+
+def test_prefix_index_search_is_case_insensitive():
+    index = build_index()
+
+    assert index.ready
+    assert index.search('MAC', limit=10) == [
+        ('novelist', 1, 'Machado de Assis')
+    ]
+    assert index.search('d', limit=10) == [('book', 1, 'Dom Casmurro')]
+    assert index.search('x', limit=10) == []
+
+
+def test_prefix_index_search_respects_limit_and_order():
+    index = build_index()
+    index.add('book', 4, 'Memorial de Aires', novelist_id=1)
+
+    assert index.search('mem', limit=10) == [
+        ('book', 4, 'Memorial de Aires'),
+        ('book', 2, 'Memórias Póstumas'),
+    ]
+    assert index.search('mem', limit=1) == [('book', 4, 'Memorial de Aires')]
+
+
+def test_prefix_index_add_replaces_previous_text():
+    index = build_index()
+
+    index.add('novelist', 1, 'Joaquim Maria')
+
+    assert index.search('machado', limit=10) == []
+    assert index.search('joaquim', limit=10) == [
+        ('novelist', 1, 'Joaquim Maria')
+    ]
+    expected_size = 5
+    assert len(index) == expected_size
+
+
+def test_prefix_index_remove_novelist_drops_its_books():
+    index = build_index()
+
+    index.remove_novelist(1)
+
+    assert index.search('m', limit=10) == []
+    assert index.search('d', limit=10) == []
+    assert index.search('a hora', limit=10) == [
+        ('book', 3, 'A Hora da Estrela')
+    ]
+
+
+def test_prefix_index_clear():
+    index = build_index()
+
+    index.clear()
+
+    assert not index.ready
+    assert index.stats() == {'ready': False, 'size': 0}
+
+
+def test_prefix_index_extend_keeps_order():
+    index = build_index()
+
+    index.extend(
+        novelists=[(3, 'Jorge Amado')],
+        books=[(4, 'Capitães da Areia', 3), (5, 'Dona Flor', 3)],
+    )
+
+    assert index.search('d', limit=10) == [
+        ('book', 1, 'Dom Casmurro'),
+        ('book', 5, 'Dona Flor'),
+    ]
+    index.remove_novelist(3)
+    assert index.search('ca', limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_sync_prefix_index_logs_failures(monkeypatch, caplog):
+    calls = 0
+
+    def broken_factory():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise asyncio.CancelledError
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(module.settings, 'AUTOCOMPLETE_REBUILD_SECS', 0)
+    monkeypatch.setattr(module, 'replica_session_factory', broken_factory)
+
+    with pytest.raises(asyncio.CancelledError):
+        await module.sync_prefix_index()
+
+    assert 'prefix index rebuild failed' in caplog.text
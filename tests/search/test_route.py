@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+
+from books_collection.book.models import Book
+from books_collection.novelist.models import Novelist
+from books_collection.search.autocomplete import load_prefix_index
+
+
+@pytest.mark.asyncio
+async def test_search_catalog(client, session, token):
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.flush()
+    session.add_all([
+        Book(year=1899, title='Dom Casmurro', novelist_id=novelist.id),
+        Book(year=1881, title='Memórias Póstumas', novelist_id=novelist.id),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/search',
+        params={'q': 'casmurro'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [
+        (result['kind'], result['text'])
+        for result in response.json()['results']
+    ] == [('book', 'Dom Casmurro')]
+
+
+def test_search_catalog_without_login(client):
+    response = client.get('/search', params={'q': 'casmurro'})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_search_catalog_with_short_query(client, token):
+    response = client.get(
+        '/search',
+        params={'q': 'a'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_autocomplete(client, session, token):
+    novelist = Novelist(name='Machado de Assis')
+    session.add(novelist)
+    await session.flush()
+    session.add(Book(year=1904, title='Esaú e Jacó', novelist_id=novelist.id))
+    await session.commit()
+    await load_prefix_index(session)
+
+    response = client.get(
+        '/autocomplete',
+        params={'prefix': 'MACH'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'suggestions': [
+            {'kind': 'novelist', 'id': novelist.id, 'text': novelist.name}
+        ]
+    }
+
+
+def test_autocomplete_tracks_novelist_writes(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    created = client.post(
+        '/novelists', json={'name': 'Clarice Lispector'}, headers=headers
+    )
+    response = client.get(
+        '/autocomplete', params={'prefix': 'clar'}, headers=headers
+    )
+
+    assert response.json()['suggestions'] == [
+        {
+            'kind': 'novelist',
+            'id': created.json()['id'],
+            'text': 'Clarice Lispector',
+        }
+    ]
@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg.errors import QueryCanceled
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from books_collection.common.exception.errors import ServiceOverloaded
+from books_collection.common.pagination import decode_cursor, encode_cursor
+from books_collection.search import service as module
+from books_collection.search.autocomplete import prefix_index
+from books_collection.search.schemas import FilterAutocomplete, FilterSearch
+from books_collection.search.service import autocomplete, search_catalog
+
+
+def make_row(kind: str, id: int, text: str, rank: float):
+    row = MagicMock(kind=kind, id=id, text=text, rank=rank)
+    row._asdict.return_value = {
+        'kind': kind,
+        'id': id,
+        'text': text,
+        'rank': rank,
+    }
+    return row
+
+
+@pytest.mark.asyncio
+async def test_search_catalog_ranked_results(mock_session):
+    rows = [
+        make_row('book', 3, 'Dom Casmurro', 0.3),
+        make_row('novelist', 1, 'Machado de Assis', 0.2),
+        make_row('book', 5, 'Memorias Postumas', 0.1),
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_session.execute.return_value = mock_result
+
+    response = await search_catalog(
+        FilterSearch(q='machado', limit=2), mock_session
+    )
+
+    timeout_call, search_call = mock_session.execute.call_args_list
+    assert 'statement_timeout' in str(timeout_call.args[0])
+
+    query = str(search_call.args[0].compile(dialect=postgresql.dialect()))
+    assert 'books.search_vector @@ websearch_to_tsquery' in query
+    assert 'novelists.search_vector @@ websearch_to_tsquery' in query
+    assert 'ORDER BY anon_1.rank DESC' in query
+    # cada lado corta os candidatos já pelo rank, não pelo id
+    assert 'ORDER BY books.id' not in query
+    assert 'ORDER BY novelists.id' not in query
+    assert ')) DESC, books.id' in query
+    assert ')) DESC, novelists.id' in query
+
+    assert [result.id for result in response.results] == [3, 1]
+    assert decode_cursor(response.next_cursor) == [0.2, 'novelist', 1]
+
+
+@pytest.mark.asyncio
+async def test_search_catalog_with_cursor(mock_session):
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    await search_catalog(
+        FilterSearch(q='machado', after=encode_cursor(0.2, 'book', 3)),
+        mock_session,
+    )
+
+    search_call = mock_session.execute.call_args_list[-1]
+    query = str(search_call.args[0].compile(dialect=postgresql.dialect()))
+    assert 'anon_1.rank <' in query
+    assert '(anon_1.kind, anon_1.id) >' in query
+
+
+@pytest.mark.asyncio
+async def test_search_catalog_over_budget(mock_session):
+    mock_session.execute.side_effect = [
+        None,
+        OperationalError('statement', {}, QueryCanceled('timeout')),
+    ]
+
+    with pytest.raises(ServiceOverloaded, match='query budget exceeded'):
+        await search_catalog(FilterSearch(q='machado'), mock_session)
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_served_from_index(mock_session, monkeypatch):
+    opened = MagicMock()
+    monkeypatch.setattr(module, 'read_session', opened)
+    prefix_index.build(novelists=[(1, 'Machado de Assis')], books=[])
+
+    response = await autocomplete(FilterAutocomplete(prefix='mach'))
+
+    assert [suggestion.text for suggestion in response.suggestions] == [
+        'Machado de Assis'
+    ]
+    opened.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_falls_back_to_database(mock_session, monkeypatch):
+    read_session = MagicMock()
+    read_session.return_value.__aenter__.return_value = mock_session
+    monkeypatch.setattr(module, 'read_session', read_session)
+    row = MagicMock()
+    row._asdict.return_value = {'kind': 'book', 'id': 3, 'text': 'Dom 100%'}
+    mock_result = MagicMock()
+    mock_result.all.return_value = [row]
+    mock_session.execute.return_value = mock_result
+
+    response = await autocomplete(
+        FilterAutocomplete(prefix='dom 100%', limit=5)
+    )
+
+    (statement,), _ = mock_session.execute.call_args
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert 'ILIKE' in str(compiled)
+    assert 'dom 100\\%%' in compiled.params.values()
+    assert response.suggestions[0].text == 'Dom 100%'